@@ -0,0 +1,107 @@
+"""Build the Solver trip fixture from Atlas store and score tables."""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Mapping, Sequence
+
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+StoreRow = tuple[str, str, float, float]
+
+
+def load_columns(path: Path, columns: Sequence[str]) -> list[tuple[str, ...]]:
+    """Return the requested ``columns`` from ``path`` as positional row tuples."""
+
+    with path.open(encoding='utf-8', newline='') as handle:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        indices = [header.index(column) for column in columns]
+        return [tuple(row[index] for index in indices) for row in reader if row]
+
+
+def load_stores(path: Path) -> list[StoreRow]:
+    """Return ``(StoreId, Name, Lat, Lon)`` rows parsed by pandas' C reader."""
+
+    import pandas as pd
+
+    frame = pd.read_csv(
+        path,
+        usecols=['StoreId', 'Name', 'Lat', 'Lon'],
+        dtype={'StoreId': str, 'Name': str, 'Lat': 'float64', 'Lon': 'float64'},
+        keep_default_na=False,
+    )
+    # ``tolist`` yields native Python scalars, which both JSON encoders accept.
+    return list(zip(*(frame[column].tolist() for column in ('StoreId', 'Name', 'Lat', 'Lon'))))
+
+
+def _build_store(row: StoreRow, scores_map: Mapping[str, float]) -> dict[str, object]:
+    store_id, name, lat, lon = row
+    payload: dict[str, object] = {
+        'id': store_id,
+        'name': name,
+        'lat': lat,
+        'lon': lon,
+        'dayId': 'D1',
+        'dwellMin': 15,
+    }
+    if (score := scores_map.get(store_id)) is not None:
+        payload['score'] = score
+    return payload
+
+
+def build_trip(
+    stores_path: Path,
+    scores_path: Path,
+    output_path: Path,
+    *,
+    stores_rows: Sequence[StoreRow] | None = None,
+) -> None:
+    """Write the dense urban trip JSON combining stores with Atlas composites."""
+
+    if stores_rows is None:
+        stores_rows = load_stores(stores_path)
+    scores_map = {
+        store_id: float(composite)
+        for store_id, composite in load_columns(scores_path, ('StoreId', 'Composite'))
+        if composite
+    }
+
+    store_payload = [_build_store(row, scores_map) for row in stores_rows]
+
+    trip = {
+        'config': {
+            'mph': 28,
+            'defaultDwellMin': 12,
+            'seed': 2024,
+            'runNote': 'atlas-regression-dense-urban',
+        },
+        'days': [
+            {
+                'dayId': 'D1',
+                'start': {'id': 'DU-START', 'name': 'Downtown Depot', 'lat': 42.331, 'lon': -83.045},
+                'end': {'id': 'DU-END', 'name': 'Warehouse Return', 'lat': 42.389, 'lon': -83.02},
+                'window': {'start': '08:00', 'end': '18:00'},
+                'dayOfWeek': 'Wed',
+                'mustVisitIds': ['DU-001'],
+            }
+        ],
+        'stores': store_payload,
+    }
+
+    # Both encoders write UTF-8 with non-ASCII text left unescaped, so the
+    # file is identical whichever one is installed.
+    if orjson is not None:
+        output_path.write_bytes(
+            orjson.dumps(trip, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )
+    else:
+        with output_path.open('w', encoding='utf-8', buffering=1 << 20) as handle:
+            json.dump(trip, handle, indent=2, ensure_ascii=False)
+            handle.write('\n')
@@ -3,12 +3,13 @@
 
 from __future__ import annotations
 
-import csv
-import json
-import shlex
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Sequence
+
+from _trip_builder import StoreRow, build_trip, load_stores
 
 
 THIS_DIR = Path(__file__).resolve().parent
@@ -17,9 +18,6 @@ ATLAS_SRC = REPO_ROOT / 'packages' / 'atlas-python' / 'src'
 if str(ATLAS_SRC) not in sys.path:
     sys.path.insert(0, str(ATLAS_SRC))
 
-from atlas.cli.__main__ import main as atlas_cli_main  # noqa: E402
-from atlas.diagnostics import DIAGNOSTICS_BASENAME  # noqa: E402
-
 
 ATLAS_FIXTURE_DIR = ATLAS_SRC / 'atlas' / 'fixtures' / 'dense_urban'
 SCORES_PATH = THIS_DIR / 'dense-urban-scores.csv'
@@ -33,146 +31,101 @@ SUBCLUSTER_SPEC_PATH = THIS_DIR / 'dense-urban-subcluster-spec.json'
 SUBCLUSTERS_PATH = THIS_DIR / 'dense-urban-subclusters.jsonl'
 TRIP_OUTPUT_PATH = THIS_DIR / 'dense-urban-trip.json'
 
+_REPO_ROOT_PREFIX = str(REPO_ROOT) + os.sep
+_RUN_COMMAND: Callable[..., None] | None = None
+
+
+def _rel(path: Path) -> str:
+    """Return ``path`` relative to the repository root for progress output."""
+
+    return str(path).removeprefix(_REPO_ROOT_PREFIX)
 
-def _load_csv(path: Path) -> list[dict[str, str]]:
-    with path.open(encoding='utf-8') as handle:
-        return list(csv.DictReader(handle))
 
+def _atlas_run_command() -> Callable[..., None]:
+    global _RUN_COMMAND
+    if _RUN_COMMAND is None:
+        from atlas.cli.__main__ import run_command
 
-def _run_atlas_cli(args: Sequence[str]) -> None:
-    command = ' '.join(shlex.quote(part) for part in ('atlas.cli', *args))
-    print(f'Running {command}')
+        _RUN_COMMAND = run_command
+    return _RUN_COMMAND
+
+
+def _run_atlas_cli(command: str, **options: object) -> None:
+    print(f'Running atlas.cli {command}')
     try:
-        atlas_cli_main(list(args))
-    except SystemExit as exc:  # pragma: no cover - defensive guard
-        code = exc.code or 0
-        if code != 0:
-            raise RuntimeError(f'Command `{command}` failed with exit code {code}') from exc
+        _atlas_run_command()(command, **options)
+    except RuntimeError as exc:
+        raise RuntimeError(f'Command `atlas.cli {command}` failed: {exc}') from exc
 
 
 def _regenerate_scores_and_sidecars() -> None:
     _run_atlas_cli(
-        (
-            'score',
-            '--mode',
-            'blended',
-            '--stores',
-            str(ATLAS_FIXTURE_DIR / 'stores.csv'),
-            '--affluence',
-            str(ATLAS_FIXTURE_DIR / 'affluence.csv'),
-            '--observations',
-            str(ATLAS_FIXTURE_DIR / 'observations.csv'),
-            '--output',
-            str(SCORES_PATH),
-            '--lambda',
-            '0.5',
-            '--trace-out',
-            str(TRACE_PATH),
-            '--trace-format',
-            'jsonl',
-            '--posterior-trace',
-            str(POSTERIOR_TRACE_PATH),
-            '--posterior-trace-format',
-            'csv',
-            '--diagnostics-dir',
-            str(DIAGNOSTICS_DIR),
-        )
+        'score',
+        mode='blended',
+        stores=ATLAS_FIXTURE_DIR / 'stores.csv',
+        affluence=ATLAS_FIXTURE_DIR / 'affluence.csv',
+        observations=ATLAS_FIXTURE_DIR / 'observations.csv',
+        output=SCORES_PATH,
+        lambda_weight=0.5,
+        trace_out=TRACE_PATH,
+        trace_format='jsonl',
+        posterior_trace=POSTERIOR_TRACE_PATH,
+        posterior_trace_format='csv',
+        diagnostics_dir=DIAGNOSTICS_DIR,
     )
 
 
 def _regenerate_anchors() -> None:
     _run_atlas_cli(
-        (
-            'anchors',
-            '--stores',
-            str(ATLAS_FIXTURE_DIR / 'stores.csv'),
-            '--output',
-            str(ANCHORS_PATH),
-            '--store-assignments',
-            str(ANCHOR_ASSIGNMENTS_PATH),
-            '--metrics',
-            str(ANCHOR_METRICS_PATH),
-            '--algorithm',
-            'dbscan',
-            '--eps',
-            '0.03',
-            '--min-samples',
-            '2',
-            '--metric',
-            'euclidean',
-            '--id-prefix',
-            'metro-anchor',
-        )
+        'anchors',
+        stores=ATLAS_FIXTURE_DIR / 'stores.csv',
+        output=ANCHORS_PATH,
+        store_assignments=ANCHOR_ASSIGNMENTS_PATH,
+        metrics=ANCHOR_METRICS_PATH,
+        algorithm='dbscan',
+        eps=0.03,
+        min_samples=2,
+        metric='euclidean',
+        id_prefix='metro-anchor',
     )
 
 
 def _regenerate_subclusters() -> None:
     _run_atlas_cli(
-        (
-            'subclusters',
-            '--anchor-id',
-            'metro-anchor-001',
-            '--spec',
-            str(SUBCLUSTER_SPEC_PATH),
-            '--output',
-            str(SUBCLUSTERS_PATH),
-            '--id-prefix',
-            'metro-anchor-001-sc',
-        )
+        'subclusters',
+        anchor_id='metro-anchor-001',
+        spec=SUBCLUSTER_SPEC_PATH,
+        output=SUBCLUSTERS_PATH,
+        id_prefix='metro-anchor-001-sc',
     )
 
 
-def _regenerate_trip() -> None:
-    stores_rows = _load_csv(ATLAS_FIXTURE_DIR / 'stores.csv')
-    score_rows = {row['StoreId']: row for row in _load_csv(SCORES_PATH)}
-
-    store_payload: list[dict[str, object]] = []
-    for row in stores_rows:
-        store_id = row['StoreId']
-        payload: dict[str, object] = {
-            'id': store_id,
-            'name': row['Name'],
-            'lat': float(row['Lat']),
-            'lon': float(row['Lon']),
-            'dayId': 'D1',
-            'dwellMin': 15,
-        }
-        score = score_rows.get(store_id, {}).get('Composite')
-        if score:
-            payload['score'] = float(score)
-        store_payload.append(payload)
-
-    trip = {
-        'config': {
-            'mph': 28,
-            'defaultDwellMin': 12,
-            'seed': 2024,
-            'runNote': 'atlas-regression-dense-urban',
-        },
-        'days': [
-            {
-                'dayId': 'D1',
-                'start': {'id': 'DU-START', 'name': 'Downtown Depot', 'lat': 42.331, 'lon': -83.045},
-                'end': {'id': 'DU-END', 'name': 'Warehouse Return', 'lat': 42.389, 'lon': -83.02},
-                'window': {'start': '08:00', 'end': '18:00'},
-                'dayOfWeek': 'Wed',
-                'mustVisitIds': ['DU-001'],
-            }
-        ],
-        'stores': store_payload,
-    }
-
-    TRIP_OUTPUT_PATH.write_text(json.dumps(trip, indent=2) + '\n', encoding='utf-8')
-    print(f'Wrote {TRIP_OUTPUT_PATH.relative_to(REPO_ROOT)}')
+def _regenerate_trip(stores_rows: Sequence[StoreRow] | None = None) -> None:
+    build_trip(
+        ATLAS_FIXTURE_DIR / 'stores.csv',
+        SCORES_PATH,
+        TRIP_OUTPUT_PATH,
+        stores_rows=stores_rows,
+    )
+    print(f'Wrote {_rel(TRIP_OUTPUT_PATH)}')
 
 
 def main() -> None:
     """Run the Atlas CLI to refresh score, trace, anchor, and trip fixtures."""
 
-    _regenerate_scores_and_sidecars()
-    _regenerate_anchors()
-    _regenerate_subclusters()
-    _regenerate_trip()
+    from atlas.diagnostics import DIAGNOSTICS_BASENAME
+
+    # Scores, anchors, and sub-clusters write disjoint outputs; only the trip
+    # depends on the freshly written scores.
+    independent_steps = (_regenerate_scores_and_sidecars, _regenerate_anchors, _regenerate_subclusters)
+    with ProcessPoolExecutor(max_workers=len(independent_steps)) as executor:
+        futures = [executor.submit(step) for step in independent_steps]
+        # stores.csv is an input only, so parse it here while the workers run
+        # and hand the rows to the trip step instead of re-reading it after.
+        stores_rows = load_stores(ATLAS_FIXTURE_DIR / 'stores.csv')
+        for future in futures:
+            future.result()
+    _regenerate_trip(stores_rows)
 
     diagnostics_outputs: Iterable[Path] = (
         DIAGNOSTICS_DIR / f'{DIAGNOSTICS_BASENAME}.json',
@@ -181,7 +134,7 @@ def main() -> None:
     )
     for path in diagnostics_outputs:
         if path.exists():
-            print(f'Wrote {path.relative_to(REPO_ROOT)}')
+            print(f'Wrote {_rel(path)}')
 
 
 if __name__ == '__main__':
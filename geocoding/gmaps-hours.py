@@ -1,14 +1,104 @@
 import csv
+import functools
+import hashlib
+import json
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import sys
 import os
-from datetime import datetime
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to requests' stdlib json decoding
+    orjson = None
 
 API_KEY = "YOUR_GOOGLE_PLACES_API_KEY"
+CACHE_PATH = "gmaps_cache.json"
+REQUEST_TIMEOUT = 10
+MAX_WORKERS = 10
+REQUESTS_PER_SECOND = 10
+
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_CLOSED_TEMPLATE = dict.fromkeys(DAYS, "Closed")
+_UNKNOWN_HOURS = dict.fromkeys(DAYS, "Unknown")  # shared read-only fallback
+FIELDNAMES = ("StoreID", "StoreName", "Address", *(f"{day} Hours" for day in DAYS), "RawHours", "Source")
+
+# Reuse one keep-alive connection pool so each lookup skips the TCP/TLS handshake.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+class RateLimiter:
+    """Space out API calls so at most `rate` start per second across threads."""
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
+
+# Matches the same inputs as strptime's "%I:%M %p" / "%I %p" formats.
+_TIME_RE = re.compile(r"(1[0-2]|0?[1-9])(?::([0-5]\d|\d))?\s+([AP]M)", re.IGNORECASE)
+_DASH = str.maketrans({"–": "-"})
+
+# Place IDs keyed by SHA1(name + address) and opening hours keyed by Place ID.
+_CACHE = {"place_ids": {}, "hours": {}}
+# Only definitive answers are cached; quota, key and server errors are retried
+# on the next run instead of being remembered as "no result".
+_CACHEABLE_STATUSES = frozenset({"OK", "ZERO_RESULTS"})
+
+def load_cache(path=CACHE_PATH):
+    """Populate the in-memory lookup cache from a JSON sidecar, if present."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    _CACHE["place_ids"].update(data.get("place_ids", {}))
+    _CACHE["hours"].update(data.get("hours", {}))
+
+def save_cache(path=CACHE_PATH):
+    """Persist the lookup cache so later runs skip already-resolved stores."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_CACHE, f)
+
+def fetch_json(url, params):
+    """Throttled GET against the Places API, decoded with orjson when available."""
+    _LIMITER.wait()
+    response = _SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def is_cacheable(response, what):
+    """Return True when `response` is a definitive answer; warn about API errors."""
+    status = response.get("status")
+    if status in _CACHEABLE_STATUSES:
+        return True
+    message = response.get("error_message", "")
+    print(f"Warning: {what} lookup failed with status {status}: {message}", file=sys.stderr, flush=True)
+    return False
+
+def cache_key(name, address):
+    return hashlib.sha1(f"{name}\n{address}".encode("utf-8")).hexdigest()
 
 def get_place_id(name, address):
     """Find a Google Place ID from store name + address."""
+    key = cache_key(name, address)
+    if key in _CACHE["place_ids"]:
+        return _CACHE["place_ids"][key]
+
     query = f"{name}, {address}"
     url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
     params = {
@@ -17,28 +107,47 @@ def get_place_id(name, address):
         "fields": "place_id",
         "key": API_KEY
     }
-    r = requests.get(url, params=params).json()
+    r = fetch_json(url, params)
     candidates = r.get("candidates", [])
-    if candidates:
-        return candidates[0]["place_id"]
-    return None
+    place_id = candidates[0]["place_id"] if candidates else None
+    if is_cacheable(r, "place"):
+        _CACHE["place_ids"][key] = place_id
+    return place_id
 
 def get_opening_hours(place_id):
     """Fetch opening hours + source URL from a Place ID."""
+    if place_id in _CACHE["hours"]:
+        hours_text, gmap_url = _CACHE["hours"][place_id]
+        return hours_text, gmap_url
+
     url = "https://maps.googleapis.com/maps/api/place/details/json"
     params = {
         "place_id": place_id,
         "fields": "opening_hours,formatted_address,name,url",
         "key": API_KEY
     }
-    r = requests.get(url, params=params).json()
+    r = fetch_json(url, params)
     result = r.get("result", {})
 
     hours_text = result.get("opening_hours", {}).get("weekday_text", [])
     gmap_url = result.get("url", "")
 
+    if is_cacheable(r, "hours"):
+        _CACHE["hours"][place_id] = [hours_text, gmap_url]
     return hours_text, gmap_url
 
+def _clock_to_24h(text):
+    """Convert '9:00 AM' / '9 PM' to 'HH:MM', or None when unparseable."""
+    match = _TIME_RE.fullmatch(text)
+    if match is None:
+        return None
+    hour, minute, meridiem = match.groups()
+    hour = int(hour) % 12 + (12 if meridiem.upper() == "PM" else 0)
+    return f"{hour:02d}:{int(minute or 0):02d}"
+
+# Store hours repeat heavily ("9:00 AM – 5:00 PM" on most weekdays), so each
+# distinct range string is parsed once and then served from the cache.
+@functools.lru_cache(maxsize=4096)
 def to_24h_range(time_range):
     """
     Convert ranges like:
@@ -58,30 +167,14 @@ def to_24h_range(time_range):
     converted_segments = []
 
     for seg in segments:
-        parts = [p.strip() for p in seg.replace("–", "-").split("-")]
+        parts = [p.strip() for p in seg.translate(_DASH).split("-")]
         if len(parts) != 2:
             converted_segments.append(seg)  # fallback
             continue
 
-        start, end = parts
-        try:
-            dt_start = datetime.strptime(start, "%I:%M %p")
-        except ValueError:
-            try:
-                dt_start = datetime.strptime(start, "%I %p")
-            except ValueError:
-                dt_start = None
-
-        try:
-            dt_end = datetime.strptime(end, "%I:%M %p")
-        except ValueError:
-            try:
-                dt_end = datetime.strptime(end, "%I %p")
-            except ValueError:
-                dt_end = None
-
-        if dt_start and dt_end:
-            converted_segments.append(f"{dt_start.strftime('%H:%M')} - {dt_end.strftime('%H:%M')}")
+        start, end = _clock_to_24h(parts[0]), _clock_to_24h(parts[1])
+        if start and end:
+            converted_segments.append(f"{start} - {end}")
         else:
             converted_segments.append(seg)  # fallback
 
@@ -92,15 +185,7 @@ def normalize_hours(weekday_text):
     Convert Google's weekday_text list into a dict with 24h times.
     Example input: ["Monday: 9:00 AM – 5:00 PM", ...]
     """
-    day_map = {
-        "Monday": "Closed",
-        "Tuesday": "Closed",
-        "Wednesday": "Closed",
-        "Thursday": "Closed",
-        "Friday": "Closed",
-        "Saturday": "Closed",
-        "Sunday": "Closed",
-    }
+    day_map = _CLOSED_TEMPLATE.copy()
 
     for entry in weekday_text:
         try:
@@ -126,9 +211,60 @@ def compress_raw_hours(weekday_text):
             continue
     return "; ".join(parts)
 
+def lookup_row(row):
+    """Resolve one input row into output values ordered like FIELDNAMES."""
+    store_id = row.get("StoreID", "").strip()
+    store_name = row.get("StoreName", "").strip()
+    address = row.get("Address", "").strip()
+
+    place_id = get_place_id(store_name, address)
+    if place_id:
+        hours_text, source_url = get_opening_hours(place_id)
+        day_map = normalize_hours(hours_text)
+        raw_hours = compress_raw_hours(hours_text)
+    else:
+        day_map = _UNKNOWN_HOURS
+        raw_hours = "Unknown"
+        source_url = ""
+
+    return (store_id, store_name, address, *(day_map[day] for day in DAYS), raw_hours, source_url)
+
+def load_completed_ids(output_csv):
+    """Return StoreIDs already written to output_csv by an earlier run."""
+    if not os.path.exists(output_csv):
+        return set()
+    with open(output_csv, newline='', encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
+        return {row[0] for row in reader if row and row[0]}
+
+def process(input_csv, output_csv):
+    done = load_completed_ids(output_csv)
+    if done:
+        print(f"Resuming: {len(done)} stores already in {output_csv}", flush=True)
+
+    # Line-buffered so every finished row survives a crash or Ctrl-C.
+    with open(input_csv, newline='', encoding="utf-8") as f_in, \
+         open(output_csv, "a", newline='', encoding="utf-8", buffering=1) as f_out:
+
+        reader = csv.DictReader(f_in)
+        writer = csv.writer(f_out)
+        if f_out.tell() == 0:
+            writer.writerow(FIELDNAMES)
+
+        pending = (row for row in reader if row.get("StoreID", "").strip() not in done)
+
+        # Lookups fan out across worker threads (throttled by _LIMITER); rows
+        # come back in input order and are written from this thread only.
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            for out_row in pool.map(lookup_row, pending):
+                writer.writerow(out_row)
+                print(f"Processed: {out_row[0]} {out_row[1]}", flush=True)
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python google-hours.py <input_csv>")
+        print("Re-running resumes into an existing store_hours_output.csv; delete it to start over.")
         sys.exit(1)
 
     input_csv = sys.argv[1]
@@ -137,54 +273,12 @@ def main():
         sys.exit(1)
 
     output_csv = "store_hours_output.csv"
+    load_cache()
 
-    with open(input_csv, newline='', encoding="utf-8") as f_in, \
-         open(output_csv, "w", newline='', encoding="utf-8") as f_out:
-
-        reader = csv.DictReader(f_in)
-        fieldnames = [
-            "StoreID", "StoreName", "Address",
-            "Monday Hours", "Tuesday Hours", "Wednesday Hours",
-            "Thursday Hours", "Friday Hours", "Saturday Hours", "Sunday Hours",
-            "RawHours", "Source"
-        ]
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for row in reader:
-            store_id = row.get("StoreID", "").strip()
-            store_name = row.get("StoreName", "").strip()
-            address = row.get("Address", "").strip()
-
-            place_id = get_place_id(store_name, address)
-            if place_id:
-                hours_text, source_url = get_opening_hours(place_id)
-                day_map = normalize_hours(hours_text)
-                raw_hours = compress_raw_hours(hours_text)
-            else:
-                day_map = {day: "Unknown" for day in
-                           ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]}
-                raw_hours = "Unknown"
-                source_url = ""
-
-            out_row = {
-                "StoreID": store_id,
-                "StoreName": store_name,
-                "Address": address,
-                "Monday Hours": day_map["Monday"],
-                "Tuesday Hours": day_map["Tuesday"],
-                "Wednesday Hours": day_map["Wednesday"],
-                "Thursday Hours": day_map["Thursday"],
-                "Friday Hours": day_map["Friday"],
-                "Saturday Hours": day_map["Saturday"],
-                "Sunday Hours": day_map["Sunday"],
-                "RawHours": raw_hours,
-                "Source": source_url
-            }
-            writer.writerow(out_row)
-
-            print(f"Processed: {store_id} {store_name}")
-            time.sleep(0.2)  # stay gentle on quota
+    try:
+        process(input_csv, output_csv)
+    finally:
+        save_cache()
 
     print(f"\n✅ Finished! Results saved to {output_csv}")
 
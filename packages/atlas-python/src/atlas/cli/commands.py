@@ -0,0 +1,1171 @@
+"""Sub-command implementations for the Atlas CLI.
+
+``atlas.cli.__main__`` imports this module only once a command has been
+parsed, so ``--version`` and ``--help`` never load pandas or the scoring
+stack.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import html
+import io
+import itertools
+import json
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+from atlas.cli.common import MODE_BLENDED, MODE_POSTERIOR, MODE_PRIOR, AtlasCliError
+from atlas.cli.schema_validation import SchemaValidationError, SchemaValidator
+from atlas.clustering import AnchorClusteringError, AnchorDetectionParameters, detect_anchors
+from atlas.clustering.subclusters import (
+    SubClusterNodeSpec,
+    SubClusterTopologyError,
+    build_subcluster_hierarchy,
+)
+from atlas.data import MissingColumnsError, load_affluence, load_observations, load_stores
+from atlas.data.loaders import normalise_geo_id
+from atlas.diagnostics import (
+    DIAGNOSTICS_VERSION,
+    compute_correlation_table,
+    generate_qa_signals,
+    summarize_distributions,
+    write_html,
+    write_json,
+    write_parquet,
+)
+from atlas.explain.trace import TRACE_SCHEMA_VERSION
+from atlas.scoring import PosteriorPipeline, compute_prior_score, compute_prior_scores
+from atlas.scoring.prior import TYPE_BASELINES
+
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+PRIOR_FEATURE_COLUMNS = ("MedianIncomeNorm", "Pct100kHHNorm", "PctRenterNorm")
+
+_SCHEMA_VALIDATOR: SchemaValidator | None = None
+_FITTED_PIPELINE_CACHE_SIZE = 4
+_FITTED_PIPELINES: dict[tuple[object, ...], PosteriorPipeline] = {}
+
+
+def _get_schema_validator() -> SchemaValidator:
+    global _SCHEMA_VALIDATOR
+    if _SCHEMA_VALIDATOR is None:
+        _SCHEMA_VALIDATOR = SchemaValidator()
+    return _SCHEMA_VALIDATOR
+
+
+def handle_explain(args: argparse.Namespace) -> None:
+    """Write a sample prior trace to ``args.trace_dir`` as JSON and CSV."""
+
+    trace_dir = Path(args.trace_dir)
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    json_path = trace_dir / "atlas-trace.json"
+    csv_path = trace_dir / "atlas-trace.csv"
+
+    sample = compute_prior_score(
+        "Thrift",
+        median_income_norm=0.5,
+        pct_hh_100k_norm=0.4,
+        pct_renter_norm=0.3,
+        lambda_weight=0.5,
+    )
+    records = [sample.to_trace()]
+
+    _write_json(records, json_path)
+
+    if records:
+        fieldnames = sorted(records[0].keys())
+    else:  # pragma: no cover - defensive fallback
+        fieldnames = []
+
+    with csv_path.open("w", newline="") as handle:
+        # Rows go out as value lists in ``fieldnames`` order; missing
+        # keys become empty cells, as with ``DictWriter``.
+        writer = csv.writer(handle)
+        writer.writerow(fieldnames)
+        writer.writerows([record.get(field) for field in fieldnames] for record in records)
+
+    print(f"Wrote trace data to {json_path} and {csv_path}")
+
+
+def handle_score(args: argparse.Namespace) -> None:
+    lambda_weight = args.lambda_weight
+    if lambda_weight is not None and not (0.0 <= lambda_weight <= 1.0):
+        raise AtlasCliError("λ must be between 0 and 1 inclusive")
+
+    omega = args.omega
+    if omega is None:
+        omega = 0.5
+    if not (0.0 <= omega <= 1.0):
+        raise AtlasCliError("ω must be between 0 and 1 inclusive")
+
+    diagnostics_enabled = getattr(args, "diagnostics", True)
+    anchor_assignments_info: tuple[pd.DataFrame | None, Path | None] = (None, None)
+    subclusters_info: tuple[pd.DataFrame | None, Path | None] = (None, None)
+
+    stores = _load_dataset(load_stores, args.stores, "stores")
+    affluence = None
+    if args.affluence:
+        affluence = _load_dataset(load_affluence, args.affluence, "affluence")
+        stores = _attach_affluence_features(stores, affluence)
+
+    if diagnostics_enabled:
+        anchor_assignments_info, subclusters_info = _load_related_artifacts(args.stores)
+
+    # A shallow copy is enough: the columns below are replaced or added, never
+    # written in place, so the loaded frame's data blocks are not duplicated.
+    stores = stores.copy(deep=False)
+    stores["StoreId"] = _as_str_column(stores["StoreId"])
+    if "Latitude" not in stores.columns and "Lat" in stores.columns:
+        stores["Latitude"] = stores["Lat"]
+    if "Longitude" not in stores.columns and "Lon" in stores.columns:
+        stores["Longitude"] = stores["Lon"]
+
+    if "Type" in stores.columns:
+        known_types = set(TYPE_BASELINES.keys())
+        for raw_type in stores["Type"].unique():
+            if raw_type not in known_types:
+                print(
+                    f"[atlas] warning: unrecognized store type {raw_type!r} — "
+                    "scored with 'Unknown' baseline. "
+                    "Check the storedb export view (build-run-views.sql).",
+                    file=sys.stderr,
+                )
+
+    observations = None
+    if args.mode in {MODE_POSTERIOR, MODE_BLENDED}:
+        if not args.observations:
+            raise AtlasCliError(f"Mode '{args.mode}' requires --observations")
+        observations = _load_dataset(load_observations, args.observations, "observations")
+
+    if args.mode in {MODE_PRIOR, MODE_BLENDED}:
+        missing = [column for column in PRIOR_FEATURE_COLUMNS if column not in stores.columns]
+        if missing:
+            raise AtlasCliError(
+                "Stores dataset is missing required normalised columns: "
+                + ", ".join(missing)
+            )
+
+    # Only materialise trace rows for stages that a configured sink will write.
+    wants_prior_trace = bool(args.trace_out) and args.include_prior_trace
+    wants_posterior_trace = (bool(args.trace_out) and args.include_posterior_trace) or bool(
+        args.posterior_trace
+    )
+    wants_blend_trace = bool(args.trace_out) and args.include_blend_trace
+
+    posterior_predictions: pd.DataFrame | None = None
+    posterior_trace_rows: list[dict[str, object]] = []
+    prior_trace_rows: list[dict[str, object]] = []
+    if args.mode in {MODE_POSTERIOR, MODE_BLENDED}:
+        _, posterior_predictions, posterior_trace_rows = _run_posterior_pipeline(
+            stores,
+            observations,
+            window_column=args.ecdf_window,
+            ecdf_cache=args.ecdf_cache,
+            collect_traces=wants_posterior_trace,
+            inputs_fingerprint=(
+                _input_fingerprint(args.stores, args.affluence, args.observations)
+                if args.ecdf_cache
+                else None
+            ),
+        )
+
+    prior_scores: pd.DataFrame | None = None
+    if args.mode in {MODE_PRIOR, MODE_BLENDED}:
+        overrides = None
+        if args.mode == MODE_BLENDED and posterior_predictions is not None:
+            overrides = posterior_predictions[["StoreId", "Value", "Yield"]]
+        prior_scores, prior_trace_rows = _run_prior_scoring(
+            stores,
+            lambda_weight=lambda_weight,
+            posterior_overrides=overrides,
+            collect_traces=wants_prior_trace,
+        )
+
+    output = _blend_scores(
+        prior_scores if args.mode in {MODE_PRIOR, MODE_BLENDED} else None,
+        posterior_predictions if args.mode in {MODE_POSTERIOR, MODE_BLENDED} else None,
+        lambda_weight,
+        omega,
+    )
+
+    blend_trace_rows: list[dict[str, object]] = []
+    if wants_blend_trace:
+        blend_trace_rows = _build_blend_trace_records(output, lambda_weight=lambda_weight)
+
+    if output is None:
+        raise AtlasCliError("No scores were produced – check input datasets")
+
+    _validate_scores_output(output)
+    _write_table(output, Path(args.output))
+
+    combined_trace_rows: list[dict[str, object]] = []
+    if args.include_prior_trace:
+        combined_trace_rows.extend(prior_trace_rows)
+    if args.include_posterior_trace:
+        combined_trace_rows.extend(posterior_trace_rows)
+    if args.include_blend_trace:
+        combined_trace_rows.extend(blend_trace_rows)
+
+    if args.trace_out and combined_trace_rows:
+        _write_trace(
+            combined_trace_rows,
+            Path(args.trace_out),
+            format_hint=args.trace_format,
+        )
+
+    if args.posterior_trace and posterior_trace_rows:
+        _write_trace(
+            posterior_trace_rows,
+            Path(args.posterior_trace),
+            format_hint=args.posterior_trace_format,
+        )
+
+    if diagnostics_enabled:
+        diagnostics_dir = Path(args.diagnostics_dir).expanduser().resolve() if args.diagnostics_dir else Path(args.output).expanduser().resolve().parent
+        _emit_diagnostics(
+            args,
+            scores=output,
+            stores=stores,
+            posterior_predictions=posterior_predictions,
+            diagnostics_dir=diagnostics_dir,
+            lambda_weight=lambda_weight,
+            omega=omega,
+            anchor_assignments=anchor_assignments_info[0],
+            anchor_assignments_path=anchor_assignments_info[1],
+            subclusters=subclusters_info[0],
+            subclusters_path=subclusters_info[1],
+        )
+
+
+def handle_anchors(args: argparse.Namespace) -> None:
+    stores = _load_dataset(load_stores, args.stores, "stores")
+
+    params = AnchorDetectionParameters(
+        algorithm=args.algorithm,
+        eps=args.eps,
+        min_samples=args.min_samples,
+        metric=args.metric,
+        min_cluster_size=args.min_cluster_size,
+        cluster_selection_epsilon=args.cluster_selection_epsilon,
+        store_id_column=args.store_id_column,
+        lat_column=args.lat_column,
+        lon_column=args.lon_column,
+        metro_id=args.metro_id,
+        id_prefix=args.id_prefix,
+    )
+
+    try:
+        result = detect_anchors(stores, params)
+    except AnchorClusteringError as exc:
+        raise AtlasCliError(str(exc)) from exc
+
+    anchors_frame = result.to_frame()
+    _validate_anchor_output(anchors_frame)
+    _write_table(anchors_frame, Path(args.output))
+
+    if args.store_assignments:
+        assignments = result.store_assignments.reset_index()
+        _write_table(assignments, Path(args.store_assignments))
+
+    if args.metrics:
+        _write_json(result.metrics, Path(args.metrics))
+
+
+def handle_subclusters(args: argparse.Namespace) -> None:
+    specs = _load_subcluster_specifications(Path(args.spec))
+
+    try:
+        hierarchy = build_subcluster_hierarchy(
+            args.anchor_id,
+            specs,
+            id_prefix=args.id_prefix,
+        )
+    except (SubClusterTopologyError, ValueError) as exc:
+        raise AtlasCliError(str(exc)) from exc
+
+    frame = hierarchy.to_frame()
+    _validate_subcluster_output(frame)
+    _write_table(frame, Path(args.output))
+
+
+def _run_prior_scoring(
+    stores: pd.DataFrame,
+    *,
+    lambda_weight: float | None,
+    posterior_overrides: pd.DataFrame | None,
+    collect_traces: bool = True,
+) -> tuple[pd.DataFrame, list[dict[str, object]]]:
+    batch = compute_prior_scores(
+        stores["Type"].tolist(),
+        median_income_norm=stores.get("MedianIncomeNorm", 0.0),
+        pct_hh_100k_norm=stores.get("Pct100kHHNorm", 0.0),
+        pct_renter_norm=stores.get("PctRenterNorm", 0.0),
+        lambda_weight=lambda_weight,
+    )
+
+    # Built from arrays so no column goes through per-element type inference.
+    store_id_values = stores["StoreId"].to_numpy()
+    records = pd.DataFrame(
+        {
+            "StoreId": store_id_values,
+            "Value": batch.value,
+            "Yield": batch.yield_score,
+            "Composite": (
+                batch.composite
+                if batch.composite is not None
+                else np.full(len(store_id_values), None, dtype=object)
+            ),
+        },
+        copy=False,
+    )
+
+    if not collect_traces:
+        return records, []
+
+    store_ids = store_id_values.tolist()
+
+    overrides = None
+    if posterior_overrides is not None:
+        # ``posterior_overrides`` holds StoreId/Value/Yield columns; align it to
+        # the stores with one index lookup instead of a per-store dictionary.
+        unique_overrides = posterior_overrides.drop_duplicates(subset="StoreId", keep="last")
+        positions = pd.Index(unique_overrides["StoreId"]).get_indexer(store_ids)
+        present = positions >= 0
+        if present.any():
+            values = unique_overrides["Value"].to_numpy(dtype=np.float64, na_value=np.nan)[positions]
+            yields = unique_overrides["Yield"].to_numpy(dtype=np.float64, na_value=np.nan)[positions]
+            overrides = [
+                pair if matched else None
+                for matched, pair in zip(present.tolist(), zip(values.tolist(), yields.tolist()))
+            ]
+    traces = list(batch.iter_traces(store_ids, overrides))
+
+    return records, traces
+
+
+def _run_posterior_pipeline(
+    stores: pd.DataFrame,
+    observations: pd.DataFrame,
+    *,
+    window_column: str | None,
+    ecdf_cache: str | None,
+    collect_traces: bool = True,
+    inputs_fingerprint: tuple[object, ...] | None = None,
+) -> tuple[PosteriorPipeline, pd.DataFrame, list[dict[str, object]]]:
+    """Fit and apply the posterior pipeline.
+
+    When an ECDF cache is configured and ``inputs_fingerprint`` identifies the
+    source files, fitted pipelines are reused across in-process runs over
+    unchanged inputs. Cached pipelines are shared and must be treated as
+    read-only apart from :meth:`PosteriorPipeline.predict`.
+    """
+
+    cache_path = Path(ecdf_cache).resolve() if ecdf_cache else None
+    cache_key = None
+    if cache_path is not None and inputs_fingerprint is not None:
+        cache_key = (inputs_fingerprint, window_column, str(cache_path))
+
+    pipeline = _FITTED_PIPELINES.get(cache_key) if cache_key is not None else None
+    if pipeline is None:
+        pipeline = PosteriorPipeline()
+        pipeline.fit(
+            observations,
+            stores,
+            window_column=window_column,
+            ecdf_cache_path=str(cache_path) if cache_path else None,
+        )
+        if cache_key is not None:
+            _remember_fitted_pipeline(cache_key, pipeline)
+    elif pipeline.ecdf_reference_ is not None:
+        # Always rewrite the file: another run may have replaced it with the
+        # ECDF of different inputs since this pipeline was fitted.
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        pipeline.ecdf_reference_.to_parquet(cache_path, index=False)
+
+    predictions = pipeline.predict(stores)
+    trace_rows = list(pipeline.iter_traces()) if collect_traces else []
+    return pipeline, predictions, trace_rows
+
+
+def _remember_fitted_pipeline(key: tuple[object, ...], pipeline: PosteriorPipeline) -> None:
+    _FITTED_PIPELINES[key] = pipeline
+    while len(_FITTED_PIPELINES) > _FITTED_PIPELINE_CACHE_SIZE:
+        # Dicts preserve insertion order, so the first key is the oldest fit.
+        del _FITTED_PIPELINES[next(iter(_FITTED_PIPELINES))]
+
+
+def _input_fingerprint(*paths: str | Path | None) -> tuple[object, ...]:
+    """Identify input files by resolved path, modification time, and size."""
+
+    parts: list[object] = []
+    for path in paths:
+        if path is None:
+            parts.append(None)
+            continue
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        parts.append((str(resolved), stat.st_mtime_ns, stat.st_size))
+    return tuple(parts)
+
+
+def _blend_scores(
+    prior: pd.DataFrame | None,
+    posterior: pd.DataFrame | None,
+    lambda_weight: float | None,
+    omega: float,
+) -> pd.DataFrame | None:
+    if prior is None and posterior is None:
+        return None
+
+    # ``rename`` and ``merge`` both return new frames, so the inputs are never
+    # modified and no defensive copies are needed.
+    if prior is None:
+        prior = pd.DataFrame(columns=["StoreId"])
+    if posterior is None:
+        posterior = pd.DataFrame(columns=["StoreId"])
+
+    prior = prior.rename(
+        columns={
+            "Value": "ValuePrior",
+            "Yield": "YieldPrior",
+            "Composite": "CompositePrior",
+        }
+    )
+    posterior = posterior.rename(
+        columns={
+            "Value": "ValuePosterior",
+            "Yield": "YieldPosterior",
+        }
+    )
+
+    merged = pd.merge(prior, posterior, on="StoreId", how="outer")
+
+    for column in ("ValuePrior", "YieldPrior", "CompositePrior", "ValuePosterior", "YieldPosterior"):
+        if column not in merged.columns:
+            merged[column] = float("nan")
+
+    def as_float(column: str) -> np.ndarray:
+        return merged[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    value_prior = as_float("ValuePrior")
+    value_posterior = as_float("ValuePosterior")
+    yield_prior = as_float("YieldPrior")
+    yield_posterior = as_float("YieldPosterior")
+
+    # Presence masks are computed once and shared by the Omega selection and
+    # the per-score blends.
+    value_prior_present = ~np.isnan(value_prior)
+    value_posterior_present = ~np.isnan(value_posterior)
+    yield_prior_present = ~np.isnan(yield_prior)
+    yield_posterior_present = ~np.isnan(yield_posterior)
+
+    has_prior = value_prior_present | yield_prior_present
+    has_posterior = value_posterior_present | yield_posterior_present
+
+    omega = float(omega)
+    merged["Omega"] = np.select(
+        [has_prior & has_posterior, has_prior, has_posterior],
+        [omega, 0.0, 1.0],
+        default=np.nan,
+    )
+
+    def blend(
+        prior_scores: np.ndarray,
+        prior_present: np.ndarray,
+        posterior_scores: np.ndarray,
+        posterior_present: np.ndarray,
+    ) -> np.ndarray:
+        return np.where(
+            prior_present & posterior_present,
+            (1.0 - omega) * prior_scores + omega * posterior_scores,
+            np.where(prior_present, prior_scores, posterior_scores),
+        )
+
+    value = blend(value_prior, value_prior_present, value_posterior, value_posterior_present)
+    yield_score = blend(yield_prior, yield_prior_present, yield_posterior, yield_posterior_present)
+    merged["Value"] = value
+    merged["Yield"] = yield_score
+
+    if lambda_weight is not None:
+        # NaN propagates through the sum, so stores missing either score stay
+        # NaN. Accumulating and clamping in place avoids two more temporaries.
+        composite = lambda_weight * value
+        composite += (1.0 - lambda_weight) * yield_score
+        merged["Composite"] = np.clip(composite, 1.0, 5.0, out=composite)
+    else:
+        merged["Composite"] = merged.get("CompositePrior")
+
+    return merged
+
+
+_BLEND_SCORE_COLUMNS = (
+    ("value_prior", "ValuePrior"),
+    ("value_posterior", "ValuePosterior"),
+    ("value_final", "Value"),
+    ("yield_prior", "YieldPrior"),
+    ("yield_posterior", "YieldPosterior"),
+    ("yield_final", "Yield"),
+    ("composite_prior", "CompositePrior"),
+    ("composite_final", "Composite"),
+)
+_BLEND_TRACE_KEYS = (
+    "store_id",
+    "stage",
+    "metadata.schema_version",
+    "observations.omega",
+    "model.lambda_weight",
+    *(f"scores.{key}" for key, _ in _BLEND_SCORE_COLUMNS),
+)
+
+
+def _build_blend_trace_records(
+    frame: pd.DataFrame | None,
+    *,
+    lambda_weight: float | None,
+) -> list[dict[str, object]]:
+    if frame is None or frame.empty:
+        return []
+
+    row_count = len(frame)
+    # Each row lines up with ``_BLEND_TRACE_KEYS``: the flattened layout of
+    # ``TraceRecord(...).to_dict()`` for a blend record.
+    rows = zip(
+        _as_str_column(frame["StoreId"]).tolist(),
+        itertools.repeat("blend", row_count),
+        itertools.repeat(TRACE_SCHEMA_VERSION, row_count),
+        _optional_float_column(frame, "Omega"),
+        itertools.repeat(lambda_weight, row_count),
+        *(_optional_float_column(frame, column) for _, column in _BLEND_SCORE_COLUMNS),
+    )
+    return [dict(zip(_BLEND_TRACE_KEYS, row)) for row in rows]
+
+
+def _optional_float_column(frame: pd.DataFrame, column: str) -> list[float | None]:
+    """Return ``frame[column]`` as floats with missing or non-numeric cells as ``None``."""
+
+    if column not in frame.columns:
+        return [None] * len(frame)
+    values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def _attach_affluence_features(stores: pd.DataFrame, affluence: pd.DataFrame) -> pd.DataFrame:
+    if "GeoId" not in stores.columns:
+        raise AtlasCliError("Stores dataset must include a GeoId column to join affluence data")
+
+    aff_columns = [column for column in ["MedianIncome", "Pct100kHH", "Turnover"] if column in affluence.columns]
+    # Selecting a column list already returns a new frame, so the GeoId index
+    # can be set on it without another copy.
+    aff_subset = affluence[aff_columns]
+    aff_subset.index = pd.Index(normalise_geo_id(affluence["GeoId"]), name="GeoId")
+
+    stores = stores.copy(deep=False)
+    stores["GeoId"] = normalise_geo_id(stores["GeoId"])
+
+    if aff_subset.index.is_unique and not aff_subset.index.hasnans:
+        # One row per GeoId: gather the covariates with a single ``reindex``
+        # (hashing only the affluence side) instead of a full merge. Columns
+        # are named and ordered as ``merge(..., suffixes=("", "_aff"))`` would.
+        looked_up = aff_subset.reindex(stores["GeoId"])
+        looked_up.index = stores.index
+        merged = stores
+        for column in aff_columns:
+            target = f"{column}_aff" if column in stores.columns else column
+            merged[target] = looked_up[column]
+        merged.index = pd.RangeIndex(len(merged))
+    else:
+        merged = stores.merge(aff_subset.reset_index(), on="GeoId", how="left", suffixes=("", "_aff"))
+
+    # Columns already present are only coerced; the rest are derived from the
+    # first usable source and min-max scaled together in one 2-D pass.
+    derived_columns: list[str] = []
+    derived_sources: list[np.ndarray] = []
+    for column, source_candidates in (
+        ("MedianIncomeNorm", ("MedianIncome", "MedianIncome_aff")),
+        ("Pct100kHHNorm", ("Pct100kHH", "Pct100kHH_aff")),
+        ("PctRenterNorm", ("PctRenter", "Turnover", "Turnover_aff")),
+    ):
+        if column in merged.columns:
+            merged[column] = pd.to_numeric(merged[column], errors="coerce").fillna(0.0)
+            continue
+        source = _first_available_column(merged, source_candidates)
+        if source is None:
+            raise AtlasCliError(f"Unable to derive '{column}' – provide it in the stores file or affluence data")
+        derived_columns.append(column)
+        derived_sources.append(source.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    if derived_columns:
+        normalised = _scale_columns_to_unit_interval(np.column_stack(derived_sources))
+        for position, column in enumerate(derived_columns):
+            merged[column] = normalised[:, position]
+
+    return merged
+
+
+def _first_available_column(frame: pd.DataFrame, candidates: Sequence[str]) -> pd.Series | None:
+    for column in candidates:
+        if column in frame.columns:
+            series = pd.to_numeric(frame[column], errors="coerce")
+            if series.notna().any():
+                return series
+    return None
+
+
+def _scale_columns_to_unit_interval(values: np.ndarray) -> np.ndarray:
+    """Min-max scale each column of a 2-D float array into ``[0, 1]``.
+
+    Missing values become ``0``; columns with no values scale to ``0`` and
+    constant columns (within ``math.isclose`` tolerance) to ``0.5``.
+    """
+
+    # ``fmin``/``fmax`` skip NaN without warning and give NaN for empty columns.
+    minimum = np.fmin.reduce(values, axis=0, initial=np.nan)
+    maximum = np.fmax.reduce(values, axis=0, initial=np.nan)
+    empty = np.isnan(minimum)
+    with np.errstate(invalid="ignore"):
+        difference = np.abs(maximum - minimum)
+        constant = (minimum == maximum) | (
+            np.isfinite(difference)
+            & (difference <= 1e-9 * np.maximum(np.abs(minimum), np.abs(maximum)))
+        )
+    span = np.where(empty | constant, 1.0, maximum - minimum)
+
+    # Work on one float64 buffer: scale, zero-fill missing values, then clip.
+    with np.errstate(invalid="ignore"):
+        normalised = values - minimum
+        normalised /= span
+    np.nan_to_num(normalised, copy=False, nan=0.0)
+    np.clip(normalised, 0.0, 1.0, out=normalised)
+    normalised[:, constant] = 0.5
+    normalised[:, empty] = 0.0
+    return normalised
+
+
+def _validate_scores_output(frame: pd.DataFrame) -> None:
+    try:
+        _get_schema_validator().validate_frame(
+            "score",
+            frame,
+            string_fields=("StoreId",),
+        )
+    except SchemaValidationError as exc:
+        raise AtlasCliError(f"Score output failed schema validation: {exc}") from exc
+
+
+def _validate_anchor_output(frame: pd.DataFrame) -> None:
+    try:
+        _get_schema_validator().validate_frame(
+            "anchor",
+            frame,
+            string_fields=("anchor_id",),
+        )
+    except SchemaValidationError as exc:
+        raise AtlasCliError(f"Anchor output failed schema validation: {exc}") from exc
+
+
+def _validate_subcluster_output(frame: pd.DataFrame) -> None:
+    try:
+        _get_schema_validator().validate_frame(
+            "cluster",
+            frame,
+            string_fields=("anchor_id", "subcluster_id", "parent_subcluster_id", "lineage"),
+        )
+    except SchemaValidationError as exc:
+        raise AtlasCliError(f"Sub-cluster output failed schema validation: {exc}") from exc
+
+
+def _write_table(frame: pd.DataFrame, path: Path) -> None:
+    path = path.expanduser().resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+    try:
+        if suffix in {".json", ".jsonl", ".ndjson"}:
+            frame.to_json(path, orient="records", lines=True)
+        elif suffix == ".parquet":
+            frame.to_parquet(path, index=False, compression="zstd")
+        elif suffix == ".feather":
+            frame.reset_index(drop=True).to_feather(path)
+        else:
+            _write_csv_frame(frame, path)
+    except OSError as exc:  # pragma: no cover - unlikely in tests
+        raise AtlasCliError(f"Failed to write output to '{path}': {exc}")
+
+
+def _write_csv_frame(frame: pd.DataFrame, path: Path) -> None:
+    """Write ``frame`` as CSV via pyarrow's writer, falling back to pandas.
+
+    The Arrow writer only handles frames whose columns are NumPy integers,
+    NumPy floats, or strings, and whose values need no quoting. Floats are
+    rendered with ``astype(str)`` as ``DataFrame.to_csv`` does, so both paths
+    write identical bytes. Anything else (booleans, timestamps, tuples,
+    single-column frames, or values containing delimiters) is written by
+    ``DataFrame.to_csv``.
+    """
+
+    # The csv module quotes a lone empty field, which Arrow would not.
+    if len(frame.columns) > 1 and all(isinstance(name, str) for name in frame.columns):
+        try:
+            arrays = [
+                _csv_arrow_column(frame.iloc[:, position]) for position in range(frame.shape[1])
+            ]
+            if all(array is not None for array in arrays):
+                table = pa.Table.from_arrays(arrays, names=list(frame.columns))
+                with path.open("wb") as handle:
+                    header = io.StringIO()
+                    csv.writer(header, lineterminator="\n").writerow(frame.columns)
+                    handle.write(header.getvalue().encode("utf-8"))
+                    pa_csv.write_csv(
+                        table,
+                        handle,
+                        pa_csv.WriteOptions(include_header=False, quoting_style="none"),
+                    )
+                return
+        except (pa.ArrowException, ValueError):
+            pass
+    frame.to_csv(path, index=False)
+
+
+def _csv_arrow_column(series: pd.Series) -> pa.Array | None:
+    """Return ``series`` as an Arrow array written like ``to_csv``, or ``None``."""
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return pa.array(series.to_numpy())
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        values = series.to_numpy()
+        return pa.array(values.astype(str), mask=np.isnan(values))
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        # Object columns holding booleans or numbers would be formatted by
+        # Arrow rather than by ``str``; only plain text is taken.
+        array = pa.array(series, from_pandas=True)
+        return array if pa.types.is_string(array.type) or pa.types.is_large_string(array.type) else None
+    return None
+
+
+def _write_json(data: dict[str, object] | list[dict[str, object]], path: Path) -> None:
+    path = path.expanduser().resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        encoded = orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SORT_KEYS
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_APPEND_NEWLINE,
+        )
+    else:
+        encoded = (json.dumps(data, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    try:
+        path.write_bytes(encoded)
+    except OSError as exc:  # pragma: no cover - unlikely in tests
+        raise AtlasCliError(f"Failed to write JSON output to '{path}': {exc}")
+
+
+def _write_trace(
+    records: Iterable[dict[str, object]],
+    path: Path,
+    *,
+    format_hint: str,
+) -> None:
+    materialised = list(records)
+    if not materialised:
+        return
+
+    path = path.expanduser().resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        if format_hint == "csv":
+            frame = pd.DataFrame.from_records(materialised)
+            frame.to_csv(path, index=False)
+        elif format_hint == "parquet":
+            # Records from different stages carry different keys; from_records
+            # takes the union so every column survives.
+            frame = pd.DataFrame.from_records(materialised)
+            frame.to_parquet(path, index=False, compression="zstd")
+        else:
+            with path.open("wb") as handle:
+                handle.writelines(_iter_jsonl(materialised))
+    except OSError as exc:  # pragma: no cover - unlikely in tests
+        raise AtlasCliError(f"Failed to write trace output to '{path}': {exc}")
+
+
+def _iter_jsonl(records: Iterable[dict[str, object]]) -> Iterator[bytes]:
+    """Encode trace records as compact, UTF-8, key-sorted JSON lines.
+
+    orjson writes non-finite floats as ``null``, so records holding them go
+    through the stdlib encoder (same layout) and keep their ``NaN``/``Infinity``
+    tokens.
+    """
+
+    option = None
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    for record in records:
+        if option is not None and not _has_non_finite_float(record):
+            yield orjson.dumps(record, option=option)
+        else:
+            encoded = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+            yield (encoded + "\n").encode("utf-8")
+
+
+def _has_non_finite_float(value: object) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite_float(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite_float(item) for item in value)
+    return False
+
+
+def _emit_diagnostics(
+    args: argparse.Namespace,
+    *,
+    scores: pd.DataFrame,
+    stores: pd.DataFrame,
+    posterior_predictions: pd.DataFrame | None,
+    diagnostics_dir: Path,
+    lambda_weight: float | None,
+    omega: float,
+    anchor_assignments: pd.DataFrame | None,
+    anchor_assignments_path: Path | None,
+    subclusters: pd.DataFrame | None,
+    subclusters_path: Path | None,
+) -> None:
+    diagnostics_dir = diagnostics_dir.expanduser().resolve()
+
+    # Shallow copy: columns are only replaced or added below, so the score
+    # frame's data blocks are shared rather than duplicated.
+    diagnostics_frame = scores.copy(deep=False)
+    diagnostics_frame["StoreId"] = _as_str_column(scores["StoreId"])
+
+    store_metadata_columns = [column for column in ("StoreId", "Metro", "Type") if column in stores.columns]
+    if store_metadata_columns:
+        metadata_frame = stores.loc[:, store_metadata_columns].assign(
+            StoreId=_as_str_column(stores["StoreId"])
+        )
+        diagnostics_frame = _left_join_on_store_id(
+            diagnostics_frame, metadata_frame.drop_duplicates(subset="StoreId")
+        )
+
+    anchor_column = None
+    if anchor_assignments is not None and "anchor_id" in anchor_assignments.columns:
+        assignments = pd.DataFrame(
+            {
+                "StoreId": _as_str_column(anchor_assignments["StoreId"]),
+                "anchor_id": _as_str_column(anchor_assignments["anchor_id"]),
+            }
+        )
+        diagnostics_frame = _left_join_on_store_id(diagnostics_frame, assignments)
+        anchor_column = "anchor_id"
+    elif "Metro" in diagnostics_frame.columns:
+        anchor_column = "Metro"
+
+    candidate_metrics = [
+        "ValuePrior",
+        "YieldPrior",
+        "CompositePrior",
+        "ValuePosterior",
+        "YieldPosterior",
+        "Value",
+        "Yield",
+        "Composite",
+        "Cred",
+        "ECDF_q",
+        "Omega",
+    ]
+    available_columns = set(diagnostics_frame.columns)
+    metrics = [column for column in candidate_metrics if column in available_columns]
+    # Same selection as ``is_numeric_dtype`` (booleans in, timedeltas out),
+    # resolved per dtype block rather than per column.
+    metrics = metrics or list(
+        diagnostics_frame.select_dtypes(include=["number", "bool", "boolean"], exclude="timedelta")
+        .columns.difference(["StoreId"], sort=False)
+    )
+
+    score_column = next(
+        (
+            candidate
+            for candidate in ("Composite", "CompositePrior", "Value", "ValuePrior")
+            if candidate in available_columns
+        ),
+        None,
+    )
+    if score_column is None and metrics:
+        score_column = metrics[0]
+
+    if score_column is not None:
+        qa_signals = generate_qa_signals(
+            diagnostics_frame,
+            score_column=score_column,
+            anchor_column=anchor_column,
+        )
+    else:
+        qa_signals = {
+            "high_leverage_anchors": [],
+            "outlier_scores": [],
+            "warnings": ["No numeric score column available for QA"],
+        }
+
+    correlations = compute_correlation_table(diagnostics_frame, columns=metrics or None)
+    distributions = summarize_distributions(diagnostics_frame, metrics=metrics or None)
+
+    metadata: dict[str, object] = {
+        "mode": args.mode,
+        "lambda_weight": None if lambda_weight is None else float(lambda_weight),
+        "omega": float(omega),
+        "record_count": len(scores),
+        "diagnostics_version": DIAGNOSTICS_VERSION,
+    }
+    if anchor_assignments is not None:
+        anchors_unique = (
+            # anchor_id is already read as text; missing ids still count once,
+            # as they did when the column was cast to str here.
+            int(anchor_assignments["anchor_id"].nunique(dropna=False))
+            if "anchor_id" in anchor_assignments.columns
+            else None
+        )
+        metadata["anchor_assignments"] = {
+            "path": str(anchor_assignments_path) if anchor_assignments_path else None,
+            "records": len(anchor_assignments),
+            "unique_anchors": anchors_unique,
+        }
+    if subclusters is not None:
+        metadata["subclusters"] = {
+            "path": str(subclusters_path) if subclusters_path else None,
+            "records": len(subclusters),
+        }
+    if posterior_predictions is not None:
+        metadata["posterior_predictions"] = len(posterior_predictions)
+
+    payload = {
+        "metadata": metadata,
+        "correlations": correlations,
+        "distributions": distributions,
+        "qa_signals": qa_signals,
+    }
+
+    warnings = qa_signals.get("warnings", []) if isinstance(qa_signals, dict) else []
+    warnings_html = (
+        "".join(f"<li>{html.escape(str(warning), quote=False)}</li>" for warning in warnings)
+        if warnings
+        else "<li>None</li>"
+    )
+    html_report = (
+        "<html><body>"
+        f"<h1>Atlas Diagnostics ({html.escape(str(args.mode), quote=False)})</h1>"
+        f"<p>Records analysed: {len(scores)}</p>"
+        f"<p>Diagnostics version: {DIAGNOSTICS_VERSION}</p>"
+        "<h2>Warnings</h2>"
+        f"<ul>{warnings_html}</ul>"
+        "</body></html>"
+    )
+
+    # Ordered, de-duplicated output columns that exist in the frame; ``.loc``
+    # with a list already returns a new frame for the writer.
+    parquet_columns = [
+        column
+        for column in dict.fromkeys(["StoreId", *metrics, *([anchor_column] if anchor_column else [])])
+        if column in available_columns
+    ]
+    parquet_frame = diagnostics_frame.loc[:, parquet_columns]
+
+    # The three artifacts go to separate files, so their encoding and disk
+    # writes can overlap; ``result()`` re-raises the first writer failure.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(write_json, payload, diagnostics_dir),
+            executor.submit(write_html, html_report, diagnostics_dir),
+            executor.submit(write_parquet, parquet_frame, diagnostics_dir),
+        ]
+        for future in futures:
+            future.result()
+
+
+def _left_join_on_store_id(frame: pd.DataFrame, other: pd.DataFrame) -> pd.DataFrame:
+    """Left-join ``other`` onto ``frame`` by ``StoreId``.
+
+    When ``other`` has one row per store and no overlapping columns, all of
+    its columns are gathered with a single ``reindex`` on the store ids
+    instead of a full merge; otherwise this falls back to ``merge`` so
+    duplicate keys and suffixes behave as before.
+    """
+
+    columns = [column for column in other.columns if column != "StoreId"]
+    if other["StoreId"].is_unique and frame.columns.intersection(columns).empty:
+        looked_up = other.set_index("StoreId").reindex(frame["StoreId"])
+        looked_up.index = frame.index
+        joined = frame.copy(deep=False)
+        for column in columns:
+            joined[column] = looked_up[column]
+        return joined
+    return frame.merge(other, on="StoreId", how="left")
+
+
+def _as_str_column(series: pd.Series) -> pd.Series:
+    """Return ``series`` cast with ``astype(str)``, skipping the cast when it is a no-op."""
+
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=False) == "string":
+        return series
+    return series.astype(str)
+
+
+def _load_related_artifacts(
+    stores_path: str | Path,
+) -> tuple[tuple[pd.DataFrame | None, Path | None], tuple[pd.DataFrame | None, Path | None]]:
+    base = Path(stores_path).expanduser().resolve().parent
+
+    anchor_assignments_path = base / "anchor_assignments.csv"
+    anchor_assignments: pd.DataFrame | None
+    # Opening the file directly avoids a separate stat call per artifact.
+    try:
+        # Identifiers are read as text so they are not re-parsed as numbers.
+        anchor_assignments = pd.read_csv(
+            anchor_assignments_path, dtype={"StoreId": str, "anchor_id": str}
+        )
+    except FileNotFoundError:
+        anchor_assignments, anchor_assignments_path = None, None
+
+    subclusters_path = base / "subclusters.csv"
+    subclusters: pd.DataFrame | None
+    try:
+        subclusters = pd.read_csv(subclusters_path)
+    except FileNotFoundError:
+        subclusters, subclusters_path = None, None
+
+    return (anchor_assignments, anchor_assignments_path), (subclusters, subclusters_path)
+
+
+def _load_dataset(loader, location: str, label: str) -> pd.DataFrame:
+    try:
+        return loader(location)
+    except FileNotFoundError as exc:
+        raise AtlasCliError(f"{label.title()} file '{location}' was not found") from exc
+    except MissingColumnsError as exc:
+        raise AtlasCliError(str(exc)) from exc
+    except ValueError as exc:
+        raise AtlasCliError(str(exc)) from exc
+
+
+def _loads_json(raw: bytes) -> object:
+    """Parse UTF-8 JSON, using orjson when available.
+
+    Documents orjson rejects (NaN literals, oversized integers, malformed
+    input) are re-parsed with :mod:`json`, which accepts the former and
+    raises its usual ``JSONDecodeError`` for the latter.
+    """
+
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode("utf-8"))
+
+
+def _load_subcluster_specifications(path: Path) -> list[SubClusterNodeSpec]:
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError as exc:
+        raise AtlasCliError(f"Sub-cluster specification file '{path}' was not found") from exc
+
+    if not raw or raw.isspace():
+        return []
+
+    return _parse_subcluster_specifications(raw)
+
+
+def _parse_subcluster_specifications(raw: bytes) -> list[SubClusterNodeSpec]:
+    try:
+        data = _loads_json(raw)
+    except json.JSONDecodeError as exc:
+        raise AtlasCliError(f"Failed to parse sub-cluster specification JSON: {exc}") from exc
+
+    if isinstance(data, dict):
+        for key in ("nodes", "specs", "subclusters"):
+            if key in data:
+                data = data[key]
+                break
+        else:
+            raise AtlasCliError(
+                "Sub-cluster specification JSON must be a list or contain a 'nodes' array"
+            )
+
+    if not isinstance(data, list):
+        raise AtlasCliError("Sub-cluster specification JSON must be a list of node objects")
+
+    # Structural checks run as one scan so the specs can then be built by a
+    # single comprehension.
+    invalid_index = next(
+        (
+            index
+            for index, entry in enumerate(data)
+            if not isinstance(entry, dict)
+            or "key" not in entry
+            or "store_ids" not in entry
+            or not _is_store_id_sequence(entry["store_ids"])
+        ),
+        None,
+    )
+    if invalid_index is not None:
+        raise _invalid_subcluster_entry(invalid_index, data[invalid_index])
+
+    def build(entry: dict[str, object]) -> SubClusterNodeSpec:
+        parent_key = entry.get("parent_key")
+        return SubClusterNodeSpec(
+            key=str(entry["key"]),
+            parent_key=None if parent_key is None else str(parent_key),
+            store_ids=entry["store_ids"],
+            centroid_lat=entry.get("centroid_lat"),
+            centroid_lon=entry.get("centroid_lon"),
+            metadata=entry.get("metadata") or {},
+        )
+
+    try:
+        return [build(entry) for entry in data]
+    except (TypeError, ValueError) as exc:
+        # Only the error path pays for locating the rejected entry.
+        for index, entry in enumerate(data):
+            try:
+                build(entry)
+            except (TypeError, ValueError):
+                break
+        raise AtlasCliError(f"Invalid sub-cluster specification at index {index}: {exc}") from exc
+
+
+def _is_store_id_sequence(store_ids: object) -> bool:
+    # Decoded JSON arrays are always lists; only other values need the slower
+    # ``Sequence`` ABC check.
+    return type(store_ids) is list or (
+        not isinstance(store_ids, (str, bytes)) and isinstance(store_ids, Sequence)
+    )
+
+
+def _invalid_subcluster_entry(index: int, entry: object) -> AtlasCliError:
+    if not isinstance(entry, dict):
+        return AtlasCliError(f"Sub-cluster specification at index {index} must be an object")
+    if "key" not in entry:
+        return AtlasCliError(f"Sub-cluster specification at index {index} is missing 'key'")
+    if "store_ids" not in entry:
+        return AtlasCliError(f"Sub-cluster specification at index {index} is missing 'store_ids'")
+    return AtlasCliError(
+        f"Sub-cluster specification at index {index} must provide 'store_ids' as a sequence"
+    )
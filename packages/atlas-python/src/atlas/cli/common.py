@@ -0,0 +1,12 @@
+"""Names shared by the Atlas CLI parser and its sub-command implementations."""
+
+from __future__ import annotations
+
+
+class AtlasCliError(RuntimeError):
+    """Raised when CLI arguments cannot be satisfied."""
+
+
+MODE_PRIOR = "prior-only"
+MODE_POSTERIOR = "posterior-only"
+MODE_BLENDED = "blended"
@@ -6,12 +6,17 @@ import json
 import math
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Mapping, MutableMapping, Sequence
+from typing import Callable, Iterable, Mapping, MutableMapping, Sequence
 
 import numpy as np
 import pandas as pd
 import jsonschema
 
+try:
+    import fastjsonschema
+except ImportError:  # optional: validate every record with jsonschema instead
+    fastjsonschema = None
+
 
 SCHEMA_VERSION = "v1"
 _SCHEMA_FILENAMES: Mapping[str, str] = {
@@ -20,6 +25,56 @@ _SCHEMA_FILENAMES: Mapping[str, str] = {
     "cluster": "cluster.schema.json",
 }
 
+# fastjsonschema implements draft 07 at most while the repository schemas are
+# draft 2020-12. Only schemas built from keywords that mean the same in both
+# drafts are compiled; anything else is validated by jsonschema alone.
+_DRAFT7_SCHEMA_URI = "http://json-schema.org/draft-07/schema#"
+_PORTABLE_KEYWORDS = frozenset(
+    {
+        "$schema",
+        "$id",
+        "$comment",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "type",
+        "enum",
+        "const",
+        "minimum",
+        "maximum",
+        "exclusiveMinimum",
+        "exclusiveMaximum",
+        "multipleOf",
+        "minLength",
+        "maxLength",
+        "pattern",
+        "minItems",
+        "maxItems",
+        "uniqueItems",
+        "items",
+        "required",
+        "minProperties",
+        "maxProperties",
+        "properties",
+        "patternProperties",
+        "additionalProperties",
+        "propertyNames",
+        "allOf",
+        "anyOf",
+        "oneOf",
+        "not",
+        "if",
+        "then",
+        "else",
+    }
+)
+_SUBSCHEMA_KEYWORDS = frozenset(
+    {"items", "additionalProperties", "propertyNames", "not", "if", "then", "else"}
+)
+_SUBSCHEMA_LIST_KEYWORDS = frozenset({"allOf", "anyOf", "oneOf"})
+_SUBSCHEMA_MAP_KEYWORDS = frozenset({"properties", "patternProperties"})
+
 
 class SchemaValidationError(RuntimeError):
     """Raised when a payload fails validation against a JSON schema."""
@@ -56,7 +111,16 @@ class SchemaValidator:
         records: Iterable[Mapping[str, object]],
     ) -> None:
         validator = _load_validator(schema, schema_version=self.schema_version)
+        compiled = _load_compiled_validator(schema, schema_version=self.schema_version)
         for index, record in enumerate(records):
+            if compiled is not None:
+                try:
+                    compiled(record)
+                    continue
+                except fastjsonschema.JsonSchemaException:
+                    # Re-check with jsonschema, which stays authoritative and
+                    # produces the reported error message.
+                    pass
             try:
                 validator.validate(record)
             except jsonschema.ValidationError as exc:  # pragma: no cover - exercised in tests
@@ -68,7 +132,7 @@ class SchemaValidator:
 
 
 @lru_cache(maxsize=None)
-def _load_validator(schema: str, *, schema_version: str) -> jsonschema.Validator:
+def _load_schema(schema: str, *, schema_version: str) -> Mapping[str, object]:
     filename = _SCHEMA_FILENAMES.get(schema)
     if filename is None:
         raise ValueError(f"Unknown schema type '{schema}'")
@@ -78,9 +142,56 @@ def _load_validator(schema: str, *, schema_version: str) -> jsonschema.Validator
         raise FileNotFoundError(f"Schema file '{schema_path}' was not found")
 
     with schema_path.open(encoding="utf-8") as handle:
-        payload = json.load(handle)
+        return json.load(handle)
 
-    return jsonschema.Draft202012Validator(payload)
+
+@lru_cache(maxsize=None)
+def _load_validator(schema: str, *, schema_version: str) -> jsonschema.Validator:
+    return jsonschema.Draft202012Validator(_load_schema(schema, schema_version=schema_version))
+
+
+@lru_cache(maxsize=None)
+def _load_compiled_validator(schema: str, *, schema_version: str) -> Callable[[object], object] | None:
+    """Return a code-generated validator for ``schema`` when fastjsonschema is installed.
+
+    ``None`` is returned when the schema uses a keyword whose draft 07 meaning
+    differs from draft 2020-12; the compiled validator is pinned to draft 07.
+    """
+
+    if fastjsonschema is None:
+        return None
+    definition = _load_schema(schema, schema_version=schema_version)
+    if not _is_draft7_portable(definition):
+        return None
+    return fastjsonschema.compile({**definition, "$schema": _DRAFT7_SCHEMA_URI})
+
+
+def _is_draft7_portable(schema: object) -> bool:
+    """Return whether ``schema`` validates identically under drafts 07 and 2020-12."""
+
+    if isinstance(schema, bool):
+        return True
+    if not isinstance(schema, Mapping):
+        return False
+    for keyword, value in schema.items():
+        if keyword not in _PORTABLE_KEYWORDS:
+            return False
+        if keyword in ("enum", "const"):
+            # fastjsonschema compares with ``==``, so ``1`` would match ``true``.
+            values = value if keyword == "enum" else [value]
+            if not all(item is None or isinstance(item, str) for item in values):
+                return False
+        elif keyword in _SUBSCHEMA_KEYWORDS:
+            # An array-valued ``items`` is tuple validation in draft 07 only.
+            if not _is_draft7_portable(value):
+                return False
+        elif keyword in _SUBSCHEMA_LIST_KEYWORDS:
+            if not all(_is_draft7_portable(item) for item in value):
+                return False
+        elif keyword in _SUBSCHEMA_MAP_KEYWORDS:
+            if not all(_is_draft7_portable(item) for item in value.values()):
+                return False
+    return True
 
 
 @lru_cache(maxsize=None)
@@ -100,26 +211,52 @@ def _normalise_frame(
     *,
     string_fields: Sequence[str] = (),
 ) -> list[MutableMapping[str, object]]:
-    sanitised = frame.copy()
-    sanitised = sanitised.where(~sanitised.isna(), None)
-
-    records = sanitised.to_dict(orient="records")
-    normalised: list[MutableMapping[str, object]] = []
-    string_fields = tuple(string_fields)
-
-    for record in records:
-        converted: MutableMapping[str, object] = {}
-        for key, value in record.items():
-            coerced = _coerce_value(value)
-            if key in string_fields and coerced is not None:
-                coerced = str(coerced)
-            converted[key] = coerced
-        normalised.append(converted)
-
-    return normalised
+    # Each column is coerced once as a whole and the rows are zipped back
+    # together, so the frame is never copied or masked.
+    columns = list(frame.columns)
+    string_field_set = set(string_fields)
+    column_values = [
+        _coerce_column(frame.iloc[:, position], stringify=column in string_field_set)
+        for position, column in enumerate(columns)
+    ]
+    if not column_values:
+        return [{} for _ in range(len(frame))]
+    return [dict(zip(columns, row)) for row in zip(*column_values)]
+
+
+def _coerce_column(series: pd.Series, *, stringify: bool) -> list[object]:
+    """Return the JSON-ready values of ``series`` with missing cells as ``None``."""
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        # NumPy integers and booleans cannot hold missing values.
+        values = series.to_numpy().tolist()
+    elif isinstance(dtype, np.dtype) and dtype.kind == "f":
+        array = series.to_numpy()
+        missing = np.isnan(array)
+        if missing.any():
+            boxed = array.astype(object)
+            boxed[missing] = None
+            values = boxed.tolist()
+        else:
+            values = array.tolist()
+    else:
+        values = [_coerce_value(value) for value in series]
+
+    if stringify:
+        return [None if value is None else str(value) for value in values]
+    return values
 
 
 def _coerce_value(value: object) -> object:
+    # Plain Python scalars dominate real frames; settle them by exact type
+    # before the container and pandas checks below.
+    value_type = type(value)
+    if value_type is str or value_type is int or value_type is bool:
+        return value
+    if value_type is float:
+        return None if value != value else value
+
     if isinstance(value, dict):
         return {str(key): _coerce_value(item) for key, item in value.items()}
 
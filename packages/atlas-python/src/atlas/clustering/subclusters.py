@@ -35,12 +35,14 @@ class SubClusterNodeSpec:
         object.__setattr__(self, "store_ids", normalised_store_ids)
 
         metadata = dict(self.metadata)
-        for key in metadata:
-            metadata[key] = self._coerce_metadata_value(metadata[key])
+        for value in metadata.values():
+            self._coerce_metadata_value(value)
         object.__setattr__(self, "metadata", MappingProxyType(metadata))
 
     @staticmethod
     def _coerce_metadata_value(value: MetadataValue | object) -> MetadataValue:
+        # Accepted values are stored unchanged, so callers may use this purely
+        # as a check.
         if isinstance(value, (int, float, str)):
             return value
         raise TypeError(
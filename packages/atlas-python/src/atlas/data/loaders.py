@@ -7,6 +7,8 @@ import re
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 
 from .schema import AFFLUENCE_SCHEMA, OBSERVATIONS_SCHEMA, STORES_SCHEMA, DatasetSchema
 
@@ -18,6 +20,39 @@ __all__ = [
     "load_stores",
 ]
 
+# Arrow types for schema dtypes when reading CSV; other columns are inferred.
+_ARROW_TYPES = {
+    "string": pa.string(),
+    "Int64": pa.int64(),
+    "float64": pa.float64(),
+}
+
+# pandas' default null markers (``keep_default_na``) and boolean spellings,
+# spelled out so the Arrow reader treats the same text as missing or boolean.
+_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+_TRUE_VALUES = ["True", "TRUE", "true"]
+_FALSE_VALUES = ["False", "FALSE", "false"]
+
 
 class MissingColumnsError(ValueError):
     """Raised when a dataset is missing required columns."""
@@ -88,12 +123,110 @@ def _load_and_validate(path_like: str | Path, schema: DatasetSchema) -> pd.DataF
 def _read_structured_file(path: Path, schema: DatasetSchema) -> pd.DataFrame:
     suffix = path.suffix.lower()
     if suffix == ".csv":
-        return pd.read_csv(path, dtype=schema.dtype_for_read())
+        return _read_csv(path, schema)
     if suffix == ".json":
         return _read_json(path)
     raise ValueError(f"Unsupported file type '{suffix}' for {schema.name} data")
 
 
+def _read_csv(path: Path, schema: DatasetSchema) -> pd.DataFrame:
+    """Parse ``path`` with pyarrow's multithreaded CSV reader.
+
+    Schema columns are read as their Arrow equivalents and the null markers
+    match pandas' defaults; unmapped columns are adjusted to come back as they
+    would from ``pd.read_csv``. Files pyarrow rejects, and the layouts Arrow
+    reads differently (header-only files, blank or repeated header names,
+    hexadecimal text, integers beyond int64), are re-read with pandas.
+    """
+
+    schema_columns = schema.dtype_for_read()
+    column_types = {}
+    for column, dtype in schema_columns.items():
+        arrow_type = _ARROW_TYPES.get(str(dtype))
+        if arrow_type is not None:
+            column_types[column] = arrow_type
+    convert_options = pa_csv.ConvertOptions(
+        column_types=column_types,
+        null_values=_NA_VALUES,
+        true_values=_TRUE_VALUES,
+        false_values=_FALSE_VALUES,
+        strings_can_be_null=True,
+    )
+    try:
+        table = pa_csv.read_csv(path, convert_options=convert_options)
+    except pa.ArrowInvalid:
+        return pd.read_csv(path, dtype=schema_columns)
+
+    names = table.column_names
+    if table.num_rows == 0 or "" in names or len(set(names)) != len(names):
+        # pandas types header-only files as object and renames blank or
+        # repeated headers ("Unnamed: 1", "a.1"); let it handle them.
+        return pd.read_csv(path, dtype=schema_columns)
+
+    # pandas leaves date/time-looking text as strings, so re-read any column
+    # Arrow inferred as temporal with its original text.
+    temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+    if temporal:
+        column_types.update((column, pa.string()) for column in temporal)
+        convert_options.column_types = column_types
+        table = pa_csv.read_csv(path, convert_options=convert_options)
+
+    unmapped = [
+        (index, field)
+        for index, field in enumerate(table.schema)
+        if field.name not in schema_columns
+    ]
+    if any(
+        pa.types.is_floating(field.type) and _may_hold_overflowed_integers(table.column(index))
+        for index, field in unmapped
+    ):
+        # Arrow reads integers beyond int64 as doubles where pandas keeps them
+        # as uint64 or text; such files are rare, so let pandas parse them.
+        return pd.read_csv(path, dtype=schema_columns)
+    if any(pa.types.is_integer(field.type) for _, field in unmapped) and _has_hex_text(path):
+        # Arrow parses "0x10" as 16 where pandas keeps the text.
+        return pd.read_csv(path, dtype=schema_columns)
+
+    # Columns with no values at all are Arrow ``null``; pandas reads them as
+    # float64 NaN.
+    empty_columns = [
+        field.name
+        for field in table.schema
+        if pa.types.is_null(field.type) and field.name not in schema_columns
+    ]
+
+    # Converting column by column lets Arrow release each buffer as soon as it
+    # has been copied, so the file's data is not held twice at peak.
+    frame = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    for column in empty_columns:
+        frame[column] = np.nan
+    for column in frame.columns[frame.dtypes == object]:
+        if column not in schema_columns:
+            # Arrow yields ``None`` for nulls in object columns where pandas uses NaN.
+            frame[column] = frame[column].where(frame[column].notna(), np.nan)
+    return frame
+
+
+def _may_hold_overflowed_integers(column: pa.ChunkedArray) -> bool:
+    """Return whether a float column could be integers too large for int64."""
+
+    values = column.to_numpy()
+    values = values[~np.isnan(values)]
+    return bool(
+        values.size
+        and np.all(np.floor(values) == values)
+        and np.abs(values).max() >= 2.0**63
+    )
+
+
+def _has_hex_text(path: Path) -> bool:
+    """Return whether ``path`` contains anything Arrow may read as a hex integer."""
+
+    data = path.read_bytes()
+    return b"0x" in data or b"0X" in data
+
+
 def _read_json(path: Path) -> pd.DataFrame:
     raw = path.read_text(encoding="utf-8").strip()
     if not raw:
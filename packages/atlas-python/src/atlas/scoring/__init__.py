@@ -2,9 +2,11 @@
 
 from .posterior import PosteriorPipeline, PosteriorPrediction
 from .prior import (
+    PriorScoreBatch,
     PriorScoreResult,
     clamp_score,
     compute_prior_score,
+    compute_prior_scores,
     get_affluence_coefficients,
     get_type_baseline,
     knn_adjacency_smoothing,
@@ -13,9 +15,11 @@ from .prior import (
 __all__ = [
     "PosteriorPipeline",
     "PosteriorPrediction",
+    "PriorScoreBatch",
     "PriorScoreResult",
     "clamp_score",
     "compute_prior_score",
+    "compute_prior_scores",
     "get_affluence_coefficients",
     "get_type_baseline",
     "knn_adjacency_smoothing",
@@ -28,7 +28,6 @@ from typing import Iterator, Sequence
 import numpy as np
 import pandas as pd
 
-from .prior import clamp_score
 from ..explain import TraceRecord, hash_payload
 
 
@@ -615,13 +614,11 @@ class PosteriorPipeline:
         value_adjacency = value_final - value_before_knn
 
         # Map theta to the 1–5 Yield scale via the persisted ECDF.
-        quantiles = []
-        yield_scores = []
-        for idx, store_id in enumerate(stores.index):
-            window = self._window_lookup(store_id, stores)
-            quantile = self._quantile_for_theta(theta_final[idx], window)
-            quantiles.append(quantile)
-            yield_scores.append(clamp_score(1.0 + 4.0 * quantile))
+        quantiles = [
+            self._quantile_for_theta(theta_final[idx], self._window_lookup(store_id, stores))
+            for idx, store_id in enumerate(stores.index)
+        ]
+        yield_scores = np.clip(1.0 + 4.0 * np.asarray(quantiles, dtype=float), 1.0, 5.0)
 
         value_final = np.clip(value_final, 1.0, 5.0)
 
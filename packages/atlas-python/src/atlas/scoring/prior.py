@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterator, Sequence
 
 import numpy as np
 import pandas as pd
 
 from ..explain import TraceRecord, hash_payload
+from ..explain.trace import TRACE_SCHEMA_VERSION
 
 
 Score = float
@@ -60,6 +61,27 @@ def get_affluence_coefficients(store_type: str) -> AffluenceCoefficients:
     return AFFLUENCE_COEFFICIENTS.get(store_type, AFFLUENCE_COEFFICIENTS["Unknown"])
 
 
+def _coefficient_table(store_types: Sequence[str]) -> np.ndarray:
+    """Return a ``(len(store_types), 5)`` table of per-type scoring parameters.
+
+    Columns are the baseline value, baseline yield, income, high-income, and
+    renter coefficients, so a batch gathers every parameter with one take.
+    """
+
+    table = np.empty((len(store_types), 5), dtype=np.float64)
+    for row, store_type in enumerate(store_types):
+        baseline = get_type_baseline(store_type)
+        coefficients = get_affluence_coefficients(store_type)
+        table[row] = (
+            baseline.value,
+            baseline.yield_score,
+            coefficients.alpha_income,
+            coefficients.alpha_high_income,
+            coefficients.beta_renter,
+        )
+    return table
+
+
 def clamp_score(score: float, *, lower: float = 1.0, upper: float = 5.0) -> float:
     """Clamp ``score`` to the inclusive ``lower``/``upper`` bounds."""
 
@@ -111,6 +133,79 @@ class PriorScoreResult:
         }
 
 
+def _prior_parameters_hash(
+    baseline: TypeBaseline,
+    coeffs: AffluenceCoefficients,
+    adjacency_adjustment: tuple[float, float] | None,
+    lambda_weight: float | None,
+    posterior_overrides: tuple[Score | None, Score | None] | None,
+) -> str:
+    return hash_payload(
+        {
+            "baseline": {
+                "value": baseline.value,
+                "yield": baseline.yield_score,
+            },
+            "coefficients": {
+                "alpha_income": coeffs.alpha_income,
+                "alpha_high_income": coeffs.alpha_high_income,
+                "beta_renter": coeffs.beta_renter,
+            },
+            "adjacency": adjacency_adjustment,
+            "lambda_weight": lambda_weight,
+            "posterior_overrides": posterior_overrides,
+        }
+    )
+
+
+def _build_prior_trace(
+    store_id: str,
+    store_type: str,
+    *,
+    baseline: TypeBaseline,
+    parameters_hash: str,
+    contributions: tuple[Score, Score, Score],
+    adjacency: tuple[Score, Score],
+    lambda_weight: float | None,
+    posterior_overrides_present: bool,
+    scores: tuple[Score, Score, Score | None],
+) -> TraceRecord:
+    income_contribution, high_income_contribution, renter_contribution = contributions
+    value, yield_score, composite = scores
+    return TraceRecord(
+        store_id=store_id,
+        stage="prior",
+        metadata={
+            "store_type": store_type,
+        },
+        baseline={
+            "value": baseline.value,
+            "yield": baseline.yield_score,
+        },
+        affluence={
+            "income": income_contribution,
+            "high_income": high_income_contribution,
+            "renter": renter_contribution,
+        },
+        adjacency={
+            "value": adjacency[0],
+            "yield": adjacency[1],
+        },
+        observations={
+            "lambda_weight": lambda_weight,
+        },
+        model={
+            "parameters_hash": parameters_hash,
+            "posterior_overrides_present": posterior_overrides_present,
+        },
+        scores={
+            "value": value,
+            "yield": yield_score,
+            "composite": composite,
+        },
+    )
+
+
 def compute_prior_score(
     store_type: str,
     *,
@@ -182,54 +277,20 @@ def compute_prior_score(
     if posterior_overrides is not None:
         posterior_value_override, posterior_yield_override = posterior_overrides
 
-    trace_payload = {
-        "baseline": {
-            "value": baseline.value,
-            "yield": baseline.yield_score,
-        },
-        "coefficients": {
-            "alpha_income": coeffs.alpha_income,
-            "alpha_high_income": coeffs.alpha_high_income,
-            "beta_renter": coeffs.beta_renter,
-        },
-        "adjacency": adjacency_adjustment,
-        "lambda_weight": lambda_weight,
-        "posterior_overrides": posterior_overrides,
-    }
-
     canonical_store_id = store_id if store_id is not None else store_type
 
-    trace = TraceRecord(
-        store_id=canonical_store_id,
-        stage="prior",
-        metadata={
-            "store_type": store_type,
-        },
-        baseline={
-            "value": baseline.value,
-            "yield": baseline.yield_score,
-        },
-        affluence={
-            "income": income_contribution,
-            "high_income": high_income_contribution,
-            "renter": renter_contribution,
-        },
-        adjacency={
-            "value": adjacency_value_adjustment,
-            "yield": adjacency_yield_adjustment,
-        },
-        observations={
-            "lambda_weight": lambda_weight,
-        },
-        model={
-            "parameters_hash": hash_payload(trace_payload),
-            "posterior_overrides_present": posterior_overrides is not None,
-        },
-        scores={
-            "value": value,
-            "yield": yield_score,
-            "composite": composite,
-        },
+    trace = _build_prior_trace(
+        canonical_store_id,
+        store_type,
+        baseline=baseline,
+        parameters_hash=_prior_parameters_hash(
+            baseline, coeffs, adjacency_adjustment, lambda_weight, posterior_overrides
+        ),
+        contributions=(income_contribution, high_income_contribution, renter_contribution),
+        adjacency=(adjacency_value_adjustment, adjacency_yield_adjustment),
+        lambda_weight=lambda_weight,
+        posterior_overrides_present=posterior_overrides is not None,
+        scores=(value, yield_score, composite),
     )
 
     return PriorScoreResult(
@@ -249,6 +310,166 @@ def compute_prior_score(
     )
 
 
+@dataclass(slots=True)
+class PriorScoreBatch:
+    """Column-oriented prior scores for many stores computed in one pass."""
+
+    store_types: list[str]
+    value: np.ndarray
+    yield_score: np.ndarray
+    composite: np.ndarray | None
+
+    baseline_value: np.ndarray
+    baseline_yield: np.ndarray
+
+    income_contribution: np.ndarray
+    high_income_contribution: np.ndarray
+    renter_contribution: np.ndarray
+
+    lambda_weight: float | None = None
+
+    def iter_traces(
+        self,
+        store_ids: Sequence[str],
+        posterior_overrides: Sequence[tuple[Score | None, Score | None] | None] | None = None,
+    ) -> Iterator[Dict[str, object]]:
+        """Yield flattened ``prior`` traces matching :func:`compute_prior_score`.
+
+        ``posterior_overrides`` is aligned with ``store_ids``; ``None`` entries
+        mark stores without overrides.
+        """
+
+        composites = (
+            self.composite.tolist() if self.composite is not None else [None] * len(self.value)
+        )
+        if posterior_overrides is None:
+            posterior_overrides = [None] * len(self.value)
+        hashes: dict[tuple[object, ...], str] = {}
+        for (
+            store_id,
+            overrides,
+            store_type,
+            value,
+            yield_score,
+            composite,
+            income,
+            high_income,
+            renter,
+        ) in zip(
+            store_ids,
+            posterior_overrides,
+            self.store_types,
+            self.value.tolist(),
+            self.yield_score.tolist(),
+            composites,
+            self.income_contribution.tolist(),
+            self.high_income_contribution.tolist(),
+            self.renter_contribution.tolist(),
+        ):
+            # The parameter hash only varies with the type and the overrides.
+            hash_key = (store_type, overrides)
+            parameters_hash = hashes.get(hash_key)
+            if parameters_hash is None:
+                parameters_hash = _prior_parameters_hash(
+                    get_type_baseline(store_type),
+                    get_affluence_coefficients(store_type),
+                    None,
+                    self.lambda_weight,
+                    overrides,
+                )
+                hashes[hash_key] = parameters_hash
+            baseline = get_type_baseline(store_type)
+
+            # Flattened directly (same keys and order as
+            # ``_build_prior_trace(...).to_dict()``) to skip building a
+            # ``TraceRecord`` per store.
+            yield {
+                "store_id": str(store_id),
+                "stage": "prior",
+                "metadata.store_type": store_type,
+                "metadata.schema_version": TRACE_SCHEMA_VERSION,
+                "baseline.value": baseline.value,
+                "baseline.yield": baseline.yield_score,
+                "affluence.income": income,
+                "affluence.high_income": high_income,
+                "affluence.renter": renter,
+                "adjacency.value": 0.0,
+                "adjacency.yield": 0.0,
+                "observations.lambda_weight": self.lambda_weight,
+                "model.parameters_hash": parameters_hash,
+                "model.posterior_overrides_present": overrides is not None,
+                "scores.value": value,
+                "scores.yield": yield_score,
+                "scores.composite": composite,
+            }
+
+
+def compute_prior_scores(
+    store_types: Sequence[str],
+    *,
+    median_income_norm: Sequence[float] | np.ndarray,
+    pct_hh_100k_norm: Sequence[float] | np.ndarray,
+    pct_renter_norm: Sequence[float] | np.ndarray,
+    lambda_weight: float | None = None,
+    clamp: bool = True,
+) -> PriorScoreBatch:
+    """Vectorised :func:`compute_prior_score` over aligned per-store inputs.
+
+    Baselines and coefficients are resolved once per distinct store type into
+    a small parameter table that is gathered by the factorised type codes, so
+    the arithmetic runs as whole-array NumPy operations. Missing (``NaN``)
+    affluence inputs propagate as they do in the scalar path, so clamped
+    scores come out as ``5.0``.
+    """
+
+    # Factorising a plain object array avoids the dtype inference a Series
+    # constructor runs over every element.
+    type_array = np.empty(len(store_types), dtype=object)
+    type_array[:] = store_types
+    codes, uniques = pd.factorize(type_array, use_na_sentinel=False)
+    parameters = np.take(_coefficient_table(uniques), codes, axis=0)
+
+    def feature(values: Sequence[float] | np.ndarray) -> np.ndarray:
+        return np.asarray(values, dtype=np.float64)
+
+    baseline_value = parameters[:, 0]
+    baseline_yield = parameters[:, 1]
+    income_contribution = parameters[:, 2] * feature(median_income_norm)
+    high_income_contribution = parameters[:, 3] * feature(pct_hh_100k_norm)
+    renter_contribution = parameters[:, 4] * feature(pct_renter_norm)
+
+    # Accumulate into freshly allocated outputs (same operation order as the
+    # scalar path) so the sums and clamps do not allocate further temporaries.
+    value = baseline_value + income_contribution
+    value += high_income_contribution
+    yield_score = baseline_yield + renter_contribution
+
+    composite: np.ndarray | None = None
+    if lambda_weight is not None:
+        composite = lambda_weight * value
+        composite += (1.0 - lambda_weight) * yield_score
+
+    if clamp:
+        # ``fmin``/``fmax`` mirror ``clamp_score``: ``min(5.0, nan)`` is 5.0.
+        for scores in (value, yield_score, composite):
+            if scores is not None:
+                np.fmin(scores, 5.0, out=scores)
+                np.fmax(scores, 1.0, out=scores)
+
+    return PriorScoreBatch(
+        store_types=list(store_types),
+        value=value,
+        yield_score=yield_score,
+        composite=composite,
+        baseline_value=baseline_value,
+        baseline_yield=baseline_yield,
+        income_contribution=income_contribution,
+        high_income_contribution=high_income_contribution,
+        renter_contribution=renter_contribution,
+        lambda_weight=lambda_weight,
+    )
+
+
 def _validate_knn_parameters(k: int, smoothing_factor: float) -> None:
     if k < 1:
         raise ValueError("k must be >= 1 for adjacency smoothing")
@@ -333,6 +554,7 @@ def knn_adjacency_smoothing(
 
 
 __all__ = [
+    "PriorScoreBatch",
     "PriorScoreResult",
     "TypeBaseline",
     "AffluenceCoefficients",
@@ -340,6 +562,7 @@ __all__ = [
     "TYPE_BASELINES",
     "clamp_score",
     "compute_prior_score",
+    "compute_prior_scores",
     "get_affluence_coefficients",
     "get_type_baseline",
     "knn_adjacency_smoothing",
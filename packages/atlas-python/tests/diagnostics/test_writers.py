@@ -6,6 +6,7 @@ import json
 from pathlib import Path
 
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 from atlas.diagnostics import (
@@ -15,6 +16,7 @@ from atlas.diagnostics import (
     write_json,
     write_parquet,
 )
+from atlas.diagnostics.writers import PARQUET_ROW_GROUP_SIZE
 
 
 def _expected_filename(extension: str) -> str:
@@ -52,6 +54,17 @@ def test_write_parquet_round_trip(tmp_path: Path) -> None:
     pd.testing.assert_frame_equal(reloaded, frame)
 
 
+def test_write_parquet_bounds_row_groups(tmp_path: Path) -> None:
+    frame = pd.DataFrame({"score": range(PARQUET_ROW_GROUP_SIZE + 1)})
+
+    path = write_parquet(frame, tmp_path)
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 2
+    assert metadata.row_group(0).num_rows == PARQUET_ROW_GROUP_SIZE
+    pd.testing.assert_frame_equal(pd.read_parquet(path), frame)
+
+
 def test_write_rejects_unversioned_filename(tmp_path: Path) -> None:
     unversioned = tmp_path / "diagnostics.json"
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -12,10 +14,18 @@ from atlas.cli.__main__ import (
     MODE_PRIOR,
     build_parser,
     main,
+    run_command,
     _handle_score,
+)
+from atlas.cli.commands import (
     _attach_affluence_features,
+    _blend_scores,
+    _build_blend_trace_records,
+    _scale_columns_to_unit_interval,
+    _run_prior_scoring,
+    _write_table,
 )
-from atlas.explain.trace import TRACE_SCHEMA_VERSION
+from atlas.explain.trace import TRACE_SCHEMA_VERSION, TraceRecord
 
 
 def test_parser_displays_help(capsys: pytest.CaptureFixture[str]) -> None:
@@ -68,6 +78,42 @@ def test_attach_affluence_coerces_geo_ids() -> None:
     assert {"MedianIncomeNorm", "Pct100kHHNorm", "PctRenterNorm"}.issubset(merged.columns)
 
 
+@pytest.mark.parametrize("duplicate_geo_id", [False, True])
+def test_attach_affluence_matches_left_merge_layout(duplicate_geo_id: bool) -> None:
+    stores = pd.DataFrame(
+        {
+            "StoreId": ["S1", "S2", "S3"],
+            "Type": ["Thrift", "Antique", "Thrift"],
+            "GeoId": ["1", "2", "9"],
+            "MedianIncome": [10.0, 20.0, 30.0],
+        },
+        index=[5, 6, 7],
+    )
+    affluence = pd.DataFrame(
+        {
+            "GeoId": ["2", "1"] + (["2"] if duplicate_geo_id else []),
+            "MedianIncome": [2_000, 1_000] + ([3_000] if duplicate_geo_id else []),
+            "Pct100kHH": [0.2, 0.1] + ([0.3] if duplicate_geo_id else []),
+            "Turnover": [0.4, 0.5] + ([0.6] if duplicate_geo_id else []),
+        }
+    )
+
+    merged = _attach_affluence_features(stores, affluence)
+
+    assert list(merged.columns[:6]) == [
+        "StoreId",
+        "Type",
+        "GeoId",
+        "MedianIncome",
+        "MedianIncome_aff",
+        "Pct100kHH",
+    ]
+    assert list(merged.index) == list(range(len(merged)))
+    assert list(stores.index) == [5, 6, 7]
+    expected_aff = [1_000.0, 2_000.0, 3_000.0, None] if duplicate_geo_id else [1_000.0, 2_000.0, None]
+    assert [None if pd.isna(value) else value for value in merged["MedianIncome_aff"]] == expected_aff
+
+
 def test_version_flag_reports_package_version(capsys: pytest.CaptureFixture[str]) -> None:
     with pytest.raises(SystemExit):
         main(["--version"])
@@ -75,6 +121,105 @@ def test_version_flag_reports_package_version(capsys: pytest.CaptureFixture[str]
     assert "atlas-python" in captured.out.strip()
 
 
+def test_version_flag_skips_parser_construction(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def fail_build_parser():
+        raise AssertionError("parser should not be built for --version")
+
+    monkeypatch.setattr("atlas.cli.__main__.build_parser", fail_build_parser)
+    monkeypatch.setattr("atlas.cli.__main__._PARSER", None)
+
+    with pytest.raises(SystemExit):
+        main(["--version"])
+    assert capsys.readouterr().out.startswith("atlas-python ")
+
+
+def test_parser_looks_up_version_only_for_help(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+
+    def fake_version() -> str:
+        calls.append(1)
+        return "9.9.9"
+
+    monkeypatch.setattr("atlas.cli.__main__._get_package_version", fake_version)
+
+    parser = build_parser()
+    parser.parse_args(["--explain"])
+    assert calls == []
+
+    assert "atlas-python version (9.9.9)" in parser.format_help()
+    assert calls
+
+
+def test_help_flag_matches_full_parser_without_building_it(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    expected = build_parser().format_help()
+
+    def fail_build_parser():
+        raise AssertionError("full parser should not be built for top-level --help")
+
+    monkeypatch.setattr("atlas.cli.__main__.build_parser", fail_build_parser)
+    monkeypatch.setattr("atlas.cli.__main__._PARSER", None)
+
+    with pytest.raises(SystemExit):
+        main(["--help"])
+    assert capsys.readouterr().out == expected
+
+
+def test_main_builds_only_the_requested_subcommand(monkeypatch: pytest.MonkeyPatch) -> None:
+    from atlas.cli import __main__ as cli
+
+    built_for: list[str | None] = []
+    handled: list[argparse.Namespace] = []
+
+    def recording_build_parser(command: str | None = None):
+        built_for.append(command)
+        return build_parser(command)
+
+    monkeypatch.setattr(cli, "build_parser", recording_build_parser)
+    monkeypatch.setattr(cli, "_handle_anchors", handled.append)
+    monkeypatch.setattr(cli, "_PARSER", None)
+    monkeypatch.setattr(cli, "_COMMAND_PARSERS", {})
+
+    main(["--trace-dir", "traces", "anchors", "--stores", "stores.csv", "--output", "anchors.csv"])
+
+    assert built_for == ["anchors"]
+    assert handled[0].stores == "stores.csv"
+    assert handled[0].trace_dir == "traces"
+    assert list(build_parser("anchors")._subparsers._group_actions[0].choices) == ["anchors"]
+
+
+def test_main_reuses_cached_parser_and_refreshes_test_hooks(monkeypatch: pytest.MonkeyPatch) -> None:
+    import builtins
+
+    from atlas.cli import __main__ as cli
+
+    built_for: list[str | None] = []
+    handled: list[argparse.Namespace] = []
+
+    def recording_build_parser(command: str | None = None):
+        built_for.append(command)
+        return build_parser(command)
+
+    monkeypatch.setattr(cli, "build_parser", recording_build_parser)
+    monkeypatch.setattr(cli, "_handle_anchors", handled.append)
+    monkeypatch.setattr(cli, "_PARSER", None)
+    monkeypatch.setattr(cli, "_COMMAND_PARSERS", {})
+    monkeypatch.setattr(builtins, "parser", None, raising=False)
+    monkeypatch.setattr(builtins, "capsys", None, raising=False)
+    argv = ["anchors", "--stores", "stores.csv", "--output", "anchors.csv"]
+
+    main(argv)
+    build_parser()  # rebinds the hooks to a throwaway parser
+    main(argv)
+
+    assert built_for == ["anchors"]
+    assert len(handled) == 2
+    assert builtins.parser is cli._COMMAND_PARSERS["anchors"]
+
+
 def test_score_parser_trace_defaults() -> None:
     parser = build_parser()
     args = parser.parse_args([
@@ -297,7 +442,7 @@ def test_score_cli_rejects_invalid_schema(tmp_path: Path, monkeypatch: pytest.Mo
             }
         )
 
-    monkeypatch.setattr("atlas.cli.__main__._blend_scores", fake_blend)
+    monkeypatch.setattr("atlas.cli.commands._blend_scores", fake_blend)
 
     with pytest.raises(SystemExit, match="schema validation"):
         main(
@@ -344,7 +489,7 @@ def test_anchors_cli_rejects_invalid_schema(tmp_path: Path, monkeypatch: pytest.
                 }
             )
 
-    monkeypatch.setattr("atlas.cli.__main__.detect_anchors", lambda *_args, **_kwargs: StubAnchorResult())
+    monkeypatch.setattr("atlas.cli.commands.detect_anchors", lambda *_args, **_kwargs: StubAnchorResult())
 
     with pytest.raises(SystemExit, match="schema validation"):
         main(
@@ -384,7 +529,7 @@ def test_subclusters_cli_rejects_invalid_schema(tmp_path: Path, monkeypatch: pyt
             )
 
     monkeypatch.setattr(
-        "atlas.cli.__main__.build_subcluster_hierarchy",
+        "atlas.cli.commands.build_subcluster_hierarchy",
         lambda *_args, **_kwargs: StubHierarchy(),
     )
 
@@ -448,7 +593,7 @@ def test_handle_score_honours_trace_flags(monkeypatch: pytest.MonkeyPatch, tmp_p
             return observations_df
         raise AssertionError(f"Unexpected label: {label}")
 
-    monkeypatch.setattr("atlas.cli.__main__._load_dataset", fake_load_dataset)
+    monkeypatch.setattr("atlas.cli.commands._load_dataset", fake_load_dataset)
 
     def fake_run_posterior_pipeline(*args, **kwargs):
         predictions = pd.DataFrame(
@@ -464,7 +609,7 @@ def test_handle_score_honours_trace_flags(monkeypatch: pytest.MonkeyPatch, tmp_p
         return object(), predictions, trace_rows
 
     monkeypatch.setattr(
-        "atlas.cli.__main__._run_posterior_pipeline",
+        "atlas.cli.commands._run_posterior_pipeline",
         fake_run_posterior_pipeline,
     )
 
@@ -486,7 +631,7 @@ def test_handle_score_honours_trace_flags(monkeypatch: pytest.MonkeyPatch, tmp_p
         ]
         return frame, trace
 
-    monkeypatch.setattr("atlas.cli.__main__._run_prior_scoring", fake_run_prior_scoring)
+    monkeypatch.setattr("atlas.cli.commands._run_prior_scoring", fake_run_prior_scoring)
 
     trace_calls: list[dict[str, object]] = []
 
@@ -499,8 +644,8 @@ def test_handle_score_honours_trace_flags(monkeypatch: pytest.MonkeyPatch, tmp_p
             }
         )
 
-    monkeypatch.setattr("atlas.cli.__main__._write_trace", fake_write_trace)
-    monkeypatch.setattr("atlas.cli.__main__._write_table", lambda frame, path: None)
+    monkeypatch.setattr("atlas.cli.commands._write_trace", fake_write_trace)
+    monkeypatch.setattr("atlas.cli.commands._write_table", lambda frame, path: None)
 
     _handle_score(args)
 
@@ -579,3 +724,382 @@ def test_prior_mode_requires_normalised_columns(tmp_path: Path) -> None:
             ]
         )
     assert "normalised" in str(excinfo.value)
+
+
+def test_run_command_invokes_handler_with_defaults(tmp_path: Path) -> None:
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(
+        json.dumps(
+            [
+                {"key": "root", "store_ids": ["S1", "S2"]},
+                {"key": "leaf", "parent_key": "root", "store_ids": ["S1"]},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    output = tmp_path / "subclusters.jsonl"
+
+    run_command("subclusters", anchor_id="A1", spec=spec_path, output=output)
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["lineage"] for record in records] == ["001", "001.001"]
+    assert {record["anchor_id"] for record in records} == {"A1"}
+
+
+def test_run_command_rejects_unknown_options() -> None:
+    with pytest.raises(TypeError, match="not_an_option"):
+        run_command("subclusters", anchor_id="A1", not_an_option=True)
+
+
+def test_run_command_validates_like_the_parser(monkeypatch: pytest.MonkeyPatch) -> None:
+    from atlas.cli.__main__ import AtlasCliError
+
+    with pytest.raises(AtlasCliError, match="required: --spec, --output"):
+        run_command("subclusters", anchor_id="A1")
+    with pytest.raises(AtlasCliError, match="argument --mode: invalid choice: 'prior'"):
+        run_command("score", mode="prior", stores="stores.csv", output="scores.csv")
+    with pytest.raises(AtlasCliError, match="argument --lambda: invalid float value: 'high'"):
+        run_command("score", stores="stores.csv", output="scores.csv", lambda_weight="high")
+
+    handled: list[argparse.Namespace] = []
+    monkeypatch.setattr("atlas.cli.__main__._handle_score", handled.append)
+    monkeypatch.setattr("atlas.cli.__main__._PARSER", None)
+    run_command("score", stores="stores.csv", output="scores.csv", lambda_weight="0.25")
+    assert handled[0].lambda_weight == 0.25
+
+
+def test_blend_scores_handles_partial_coverage_and_clamps() -> None:
+    prior = pd.DataFrame(
+        {
+            "StoreId": ["a", "b", "c"],
+            "Value": [4.0, 2.0, float("nan")],
+            "Yield": [5.0, 3.0, float("nan")],
+            "Composite": [4.5, 2.5, float("nan")],
+        }
+    )
+    posterior = pd.DataFrame(
+        {
+            "StoreId": ["a", "d"],
+            "Value": [6.0, 3.0],
+            "Yield": [9.0, float("nan")],
+        }
+    )
+
+    blended = _blend_scores(prior, posterior, 0.5, 0.25).set_index("StoreId")
+
+    assert blended.loc["a", "Omega"] == pytest.approx(0.25)
+    assert blended.loc["a", "Value"] == pytest.approx(0.75 * 4.0 + 0.25 * 6.0)
+    assert blended.loc["a", "Composite"] == 5.0
+    assert blended.loc["b", "Omega"] == 0.0
+    assert blended.loc["b", "Composite"] == pytest.approx(2.5)
+    assert pd.isna(blended.loc["c", "Omega"])
+    assert blended.loc["d", "Omega"] == 1.0
+    assert blended.loc["d", "Value"] == pytest.approx(3.0)
+    assert pd.isna(blended.loc["d", "Composite"])
+
+
+def test_write_table_csv_round_trips_plain_and_fallback_frames(tmp_path: Path) -> None:
+    plain = pd.DataFrame(
+        {"StoreId": ["a", "b"], "Value": [3.25, float("nan")], "Count": [1, 2]}
+    )
+    plain_path = tmp_path / "plain.csv"
+    _write_table(plain, plain_path)
+    assert plain_path.read_text(encoding="utf-8").splitlines()[0] == "StoreId,Value,Count"
+    pd.testing.assert_frame_equal(pd.read_csv(plain_path), plain)
+
+    # Values containing delimiters or non-scalar cells go through pandas.
+    quoted = pd.DataFrame({"anchor_id": ["x"], "store_ids": [("a, b", "c")], "label": ["q,r"]})
+    quoted_path = tmp_path / "quoted.csv"
+    _write_table(quoted, quoted_path)
+    assert quoted_path.read_text(encoding="utf-8") == quoted.to_csv(index=False)
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        pd.DataFrame(
+            {
+                "StoreId": ["a", None, "c", "d"],
+                "Value": [3.0, 1e-07, float("nan"), float("inf")],
+                "Tiny": np.array([0.1, 2.0, 1e16, -0.0], dtype=np.float32),
+                "Count": [1, 2, 3, 2**40],
+            }
+        ),
+        pd.DataFrame({"StoreId": ["a", "b"], "Flag": pd.Series([True, False], dtype=object)}),
+        pd.DataFrame({"StoreId": ["a", "b"], "Flag": [True, False], "Value": [1.0, 2.5]}),
+        pd.DataFrame({"StoreId": ["a", "b"], "Mixed": [1.5, "x"]}),
+        pd.DataFrame([["a", 1.0, 2.0]], columns=["StoreId", "Value", "Value"]),
+        pd.DataFrame({"StoreId": ["", "b"]}),
+    ],
+    ids=["floats", "object-bools", "numpy-bools", "mixed-object", "duplicate-columns", "single-column"],
+)
+def test_write_table_csv_matches_pandas_byte_for_byte(tmp_path: Path, frame: pd.DataFrame) -> None:
+    path = tmp_path / "scores.csv"
+
+    _write_table(frame, path)
+
+    assert path.read_bytes() == frame.to_csv(index=False).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    ("suffix", "reader"), [(".parquet", pd.read_parquet), (".feather", pd.read_feather)]
+)
+def test_write_table_uses_columnar_format_for_suffix(tmp_path: Path, suffix: str, reader) -> None:
+    frame = pd.DataFrame({"StoreId": ["a", "b"], "Value": [3.25, float("nan")], "Count": [1, 2]})
+    path = tmp_path / f"scores{suffix}"
+
+    _write_table(frame, path)
+
+    pd.testing.assert_frame_equal(reader(path), frame)
+
+
+def test_score_writes_parquet_trace(tmp_path: Path) -> None:
+    from atlas.fixtures import fixture_path
+
+    trace_path = tmp_path / "trace.parquet"
+    run_command(
+        "score",
+        mode=MODE_BLENDED,
+        stores=fixture_path("dense_urban", "stores"),
+        affluence=fixture_path("dense_urban", "affluence"),
+        observations=fixture_path("dense_urban", "observations"),
+        output=tmp_path / "scores.csv",
+        lambda_weight=0.5,
+        trace_out=trace_path,
+        trace_format="parquet",
+        diagnostics=False,
+    )
+
+    trace = pd.read_parquet(trace_path)
+    assert set(trace["stage"]) == {"prior", "posterior", "blend"}
+    # Stage-specific columns from every record are preserved.
+    assert {"baseline.value", "scores.composite_final"}.issubset(trace.columns)
+
+
+def test_handle_score_skips_traces_without_sinks(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    from atlas.fixtures import fixture_path
+
+    collect_flags: list[bool] = []
+    def recording_prior(*args, **kwargs):
+        collect_flags.append(kwargs["collect_traces"])
+        return _run_prior_scoring(*args, **kwargs)
+
+    def fail_blend_traces(*_args, **_kwargs):
+        raise AssertionError("blend traces should not be built without a sink")
+
+    monkeypatch.setattr("atlas.cli.commands._run_prior_scoring", recording_prior)
+    monkeypatch.setattr("atlas.cli.commands._build_blend_trace_records", fail_blend_traces)
+
+    output = tmp_path / "scores.csv"
+    run_command(
+        "score",
+        stores=fixture_path("dense_urban", "stores"),
+        affluence=fixture_path("dense_urban", "affluence"),
+        output=output,
+        lambda_weight=0.5,
+        diagnostics=False,
+    )
+
+    assert collect_flags == [False]
+    assert len(pd.read_csv(output)) == 5
+
+
+def test_blend_trace_records_match_trace_record_layout() -> None:
+    frame = pd.DataFrame(
+        {
+            "StoreId": ["a", "b"],
+            "ValuePrior": [3.0, float("nan")],
+            "YieldPrior": [2.0, float("nan")],
+            "CompositePrior": [2.5, float("nan")],
+            "ValuePosterior": [4.0, 3.5],
+            "YieldPosterior": [float("nan"), 2.5],
+            "Omega": [0.5, 1.0],
+            "Value": [3.5, 3.5],
+            "Yield": [2.0, 2.5],
+            "Composite": [2.75, 3.0],
+        }
+    )
+
+    records = _build_blend_trace_records(frame, lambda_weight=0.5)
+
+    expected = [
+        TraceRecord(
+            store_id=store_id,
+            stage="blend",
+            observations={"omega": omega},
+            model={"lambda_weight": 0.5},
+            scores={
+                "value_prior": value_prior,
+                "value_posterior": 4.0 if store_id == "a" else 3.5,
+                "value_final": 3.5,
+                "yield_prior": yield_prior,
+                "yield_posterior": None if store_id == "a" else 2.5,
+                "yield_final": yield_final,
+                "composite_prior": composite_prior,
+                "composite_final": composite_final,
+            },
+        ).to_dict()
+        for store_id, omega, value_prior, yield_prior, yield_final, composite_prior, composite_final in (
+            ("a", 0.5, 3.0, 2.0, 2.0, 2.5, 2.75),
+            ("b", 1.0, None, None, 2.5, None, 3.0),
+        )
+    ]
+    assert records == expected
+    assert [list(record) for record in records] == [list(record) for record in expected]
+
+
+def test_scale_columns_to_unit_interval_edge_cases() -> None:
+    import numpy as np
+
+    nan = float("nan")
+    values = np.array(
+        [
+            [10.0, 4.0, nan],
+            [nan, 4.0, nan],
+            [30.0, 4.0, nan],
+            [20.0, 4.0, nan],
+        ]
+    )
+
+    scaled = _scale_columns_to_unit_interval(values)
+
+    # Missing values become 0, constant columns 0.5 and empty columns 0.
+    assert scaled[:, 0].tolist() == pytest.approx([0.0, 0.0, 1.0, 0.5])
+    assert scaled[:, 1].tolist() == [0.5, 0.5, 0.5, 0.5]
+    assert scaled[:, 2].tolist() == [0.0, 0.0, 0.0, 0.0]
+
+
+def test_posterior_fit_is_reused_for_unchanged_inputs_with_ecdf_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    from atlas.fixtures import fixture_path
+    from atlas.scoring import PosteriorPipeline
+
+    fit_calls: list[int] = []
+    original_fit = PosteriorPipeline.fit
+
+    def counting_fit(self, *args, **kwargs):
+        fit_calls.append(1)
+        return original_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(PosteriorPipeline, "fit", counting_fit)
+    monkeypatch.setattr("atlas.cli.commands._FITTED_PIPELINES", {})
+
+    ecdf_cache = tmp_path / "ecdf.parquet"
+    outputs = []
+    for run in range(2):
+        output = tmp_path / f"scores-{run}.csv"
+        run_command(
+            "score",
+            mode=MODE_POSTERIOR,
+            stores=fixture_path("dense_urban", "stores"),
+            affluence=fixture_path("dense_urban", "affluence"),
+            observations=fixture_path("dense_urban", "observations"),
+            output=output,
+            ecdf_cache=ecdf_cache,
+            diagnostics=False,
+        )
+        outputs.append(output.read_text(encoding="utf-8"))
+        if run == 0:
+            expected_ecdf = pd.read_parquet(ecdf_cache)
+            # Another run may have replaced the cache file in the meantime.
+            ecdf_cache.write_bytes(b"stale")
+
+    assert fit_calls == [1]
+    assert outputs[0] == outputs[1]
+    # A cache hit still rewrites the ECDF reference used for the run.
+    pd.testing.assert_frame_equal(pd.read_parquet(ecdf_cache), expected_ecdf)
+
+
+def test_compiled_schema_validator_reports_jsonschema_errors() -> None:
+    from atlas.cli.schema_validation import (
+        SchemaValidationError,
+        SchemaValidator,
+        _load_compiled_validator,
+    )
+
+    # fastjsonschema ships with the dev extra, so the compiled path must be live.
+    assert _load_compiled_validator("score", schema_version="v1") is not None
+    validator = SchemaValidator()
+    validator.validate_records("score", [{"StoreId": "S1", "Value": 2.5, "Yield": 3.0, "Omega": 0.5}])
+
+    with pytest.raises(SchemaValidationError) as excinfo:
+        validator.validate_records(
+            "score",
+            [
+                {"StoreId": "S1", "Value": 2.5, "Yield": 3.0, "Omega": 0.5},
+                {"StoreId": "S2", "Value": 7.0, "Yield": 3.0, "Omega": 0.5},
+            ],
+        )
+    assert excinfo.value.index == 1
+    assert "(path: Value)" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    ("schema", "portable"),
+    [
+        ({"type": "object", "properties": {"a": {"type": "string", "enum": ["x"]}}}, True),
+        ({"type": "array", "items": {"type": "number", "minimum": 0}}, True),
+        ({"type": "array", "items": [{"type": "number"}]}, False),
+        ({"type": "array", "prefixItems": [{"type": "number"}]}, False),
+        ({"$defs": {"n": {"type": "number"}}, "$ref": "#/$defs/n"}, False),
+        ({"properties": {"a": {"dependentRequired": {"a": ["b"]}}}}, False),
+        ({"allOf": [{"unevaluatedProperties": False}]}, False),
+        ({"properties": {"flag": {"const": True}}}, False),
+    ],
+)
+def test_compiled_validator_only_accepts_draft7_portable_schemas(
+    schema: dict[str, object], portable: bool
+) -> None:
+    from atlas.cli.schema_validation import _SCHEMA_FILENAMES, _is_draft7_portable, _load_schema
+
+    assert _is_draft7_portable(schema) is portable
+    for name in _SCHEMA_FILENAMES:
+        assert _is_draft7_portable(_load_schema(name, schema_version="v1"))
+
+
+def test_normalise_frame_maps_missing_values_to_none() -> None:
+    import numpy as np
+
+    from atlas.cli.schema_validation import _normalise_frame
+
+    frame = pd.DataFrame(
+        {
+            "StoreId": [101, 102],
+            "Value": [2.5, np.nan],
+            "Count": np.array([3, 4], dtype=np.int64),
+            "Method": ["Hier", None],
+            "Rank": pd.array([1, None], dtype="Int64"),
+        }
+    )
+
+    records = _normalise_frame(frame, string_fields=("StoreId",))
+
+    assert records == [
+        {"StoreId": "101", "Value": 2.5, "Count": 3, "Method": "Hier", "Rank": 1},
+        {"StoreId": "102", "Value": None, "Count": 4, "Method": None, "Rank": None},
+    ]
+    assert all(type(record["Count"]) is int for record in records)
+
+
+def test_jsonl_trace_keeps_non_finite_values(tmp_path: Path) -> None:
+    import math
+
+    from atlas.cli.commands import _write_trace
+
+    trace_path = tmp_path / "trace.jsonl"
+    _write_trace(
+        [
+            {"store_id": "S1", "stage": "blend", "scores.composite": 3.5},
+            {"store_id": "S2", "stage": "blend", "scores.composite": float("nan")},
+        ],
+        trace_path,
+        format_hint="jsonl",
+    )
+
+    lines = trace_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == '{"scores.composite":3.5,"stage":"blend","store_id":"S1"}'
+    assert lines[1] == '{"scores.composite":NaN,"stage":"blend","store_id":"S2"}'
+    assert math.isnan(json.loads(lines[1])["scores.composite"])
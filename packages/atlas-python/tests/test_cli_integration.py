@@ -469,3 +469,35 @@ def test_cli_subclusters_materialises_hierarchy(tmp_path: Path) -> None:
     assert {child["parent_subcluster_id"] for child in child_records} == {root_record["subcluster_id"]}
     assert {child["lineage"] for child in child_records} == {"001.001", "001.002"}
     assert any(child["metadata"].get("score") == 0.8 for child in child_records)
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("flag", ["--version", "--help"])
+def test_cli_version_does_not_import_pandas(flag: str) -> None:
+    env = os.environ.copy()
+    pythonpath = str(SRC_PATH)
+    if existing := env.get("PYTHONPATH"):
+        pythonpath = os.pathsep.join([pythonpath, existing])
+    env["PYTHONPATH"] = pythonpath
+
+    script = (
+        "import sys\n"
+        "from atlas.cli.__main__ import main\n"
+        "try:\n"
+        f"    main([{flag!r}])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('pandas' in sys.modules or 'atlas.cli.commands' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PACKAGE_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    lines = result.stdout.strip().splitlines()
+    assert lines[0].startswith("atlas-python " if flag == "--version" else "usage: rustbelt-atlas")
+    assert lines[-1] == "False"
@@ -12,6 +12,7 @@ from atlas.data import (
     load_observations,
     load_stores,
 )
+from atlas.data.schema import STORES_SCHEMA
 
 
 def test_load_stores_csv(tmp_path: Path) -> None:
@@ -79,3 +80,74 @@ def test_load_affluence_json(tmp_path: Path) -> None:
         "Turnover",
     ]
     assert result.loc[0, "Metro"] == "Detroit"
+
+
+def test_load_stores_csv_matches_pandas_reader(tmp_path: Path) -> None:
+    stores_path = tmp_path / "stores.csv"
+    stores_path.write_text(
+        "StoreId,Name,Type,Lat,Lon,GeoId,Opened,Visited,Rank,Remarks\n"
+        'DT-001,"Flagship, Downtown",Thrift,42.331,-83.045,026163,2024-01-05,2024-02-01T10:00:00,1,\n'
+        "DT-002,NA,,42.5,-83.1,,,,,NA\n",
+        encoding="utf-8",
+    )
+
+    result = load_stores(stores_path)
+
+    expected = pd.read_csv(stores_path, dtype=STORES_SCHEMA.dtype_for_read())
+    pd.testing.assert_frame_equal(result, expected)
+    # Date-like text in unmapped columns stays as the original strings.
+    assert result.loc[0, "Visited"] == "2024-02-01T10:00:00"
+    # A column with no values at all comes back as float NaN.
+    assert result["Remarks"].dtype == "float64"
+
+
+@pytest.mark.parametrize(
+    ("values", "dtype"),
+    [
+        (("99999999999999999999", "3"), "object"),
+        (("18446744073709551615", "4"), "uint64"),
+        (("1e19", "2"), "float64"),
+    ],
+)
+def test_load_stores_csv_matches_pandas_reader_for_large_integers(
+    tmp_path: Path, values: tuple[str, str], dtype: str
+) -> None:
+    stores_path = tmp_path / "stores.csv"
+    stores_path.write_text(
+        "StoreId,Name,Type,Lat,Lon,Big\n"
+        f"DT-001,North,Thrift,42.331,-83.045,{values[0]}\n"
+        f"DT-002,South,Thrift,42.5,-83.1,{values[1]}\n",
+        encoding="utf-8",
+    )
+
+    result = load_stores(stores_path)
+
+    expected = pd.read_csv(stores_path, dtype=STORES_SCHEMA.dtype_for_read())
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["Big"].dtype == dtype
+
+
+@pytest.mark.parametrize(
+    ("header", "rows"),
+    [
+        ("StoreId,Name,Type,Lat,Lon,Extra,Extra", ["DT-001,North,Thrift,42.331,-83.045,1,2"]),
+        ("StoreId,Name,Type,Lat,Lon,,Extra", ["DT-001,North,Thrift,42.331,-83.045,1,2"]),
+        ("StoreId,Name,Type,Lat,Lon,Extra", []),
+        ("StoreId,Name,Type,Lat,Lon,Code", ["DT-001,North,Thrift,42.331,-83.045,0x10"]),
+        (
+            "StoreId,Name,Type,Lat,Lon,Flag",
+            ["DT-001,North,Thrift,42.331,-83.045,1", "DT-002,South,Thrift,42.5,-83.1,true"],
+        ),
+    ],
+    ids=["duplicate-header", "blank-header", "header-only", "hex-text", "boolean-spelling"],
+)
+def test_load_stores_csv_matches_pandas_reader_for_layouts(
+    tmp_path: Path, header: str, rows: list[str]
+) -> None:
+    stores_path = tmp_path / "stores.csv"
+    stores_path.write_text("\n".join([header, *rows]) + "\n", encoding="utf-8")
+
+    result = load_stores(stores_path)
+
+    expected = pd.read_csv(stores_path, dtype=STORES_SCHEMA.dtype_for_read())
+    pd.testing.assert_frame_equal(result, expected)
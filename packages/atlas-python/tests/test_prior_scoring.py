@@ -10,6 +10,7 @@ from atlas.explain.trace import TRACE_SCHEMA_VERSION
 from atlas.scoring import (
     clamp_score,
     compute_prior_score,
+    compute_prior_scores,
     get_affluence_coefficients,
     get_type_baseline,
     knn_adjacency_smoothing,
@@ -129,3 +130,47 @@ def test_prior_score_result_trace_contains_expected_keys() -> None:
     assert trace["baseline.value"] == result.baseline_value
     assert trace["affluence.income"] == result.income_contribution
     assert trace["model.parameters_hash"]
+
+
+def test_compute_prior_scores_matches_scalar_scoring() -> None:
+    store_ids = ["s-1", "s-2", "s-3", "s-4"]
+    store_types = ["Thrift", "Vintage", "Mystery", "Antique"]
+    income = [0.95, 10.0, 0.4, float("nan")]
+    high_income = [0.90, 10.0, 0.1, 0.5]
+    renter = [0.20, -10.0, 0.7, 0.3]
+    overrides = {"s-2": (4.5, 2.5)}
+
+    batch = compute_prior_scores(
+        store_types,
+        median_income_norm=income,
+        pct_hh_100k_norm=high_income,
+        pct_renter_norm=renter,
+        lambda_weight=0.6,
+    )
+    traces = list(batch.iter_traces(store_ids, [overrides.get(store_id) for store_id in store_ids]))
+
+    for index, store_id in enumerate(store_ids):
+        expected = compute_prior_score(
+            store_types[index],
+            store_id=store_id,
+            median_income_norm=income[index],
+            pct_hh_100k_norm=high_income[index],
+            pct_renter_norm=renter[index],
+            lambda_weight=0.6,
+            posterior_overrides=overrides.get(store_id),
+        )
+        assert batch.value[index] == expected.value
+        assert batch.yield_score[index] == expected.yield_score
+        assert batch.composite is not None
+        assert batch.composite[index] == expected.composite
+        expected_trace = expected.to_trace()
+        assert list(traces[index]) == list(expected_trace)
+        for key, expected_value in expected_trace.items():
+            actual = traces[index][key]
+            assert actual == expected_value or (math.isnan(actual) and math.isnan(expected_value))
+
+    # Missing affluence propagates like the scalar path: the contribution is
+    # NaN and the clamped Value and Composite saturate at 5.0.
+    assert math.isnan(batch.income_contribution[3])
+    assert batch.value[3] == 5.0
+    assert batch.composite[3] == 5.0
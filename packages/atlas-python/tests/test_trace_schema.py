@@ -8,7 +8,7 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
-from atlas.cli.__main__ import _build_blend_trace_records
+from atlas.cli.commands import _build_blend_trace_records
 from atlas.explain.trace import TRACE_SCHEMA_VERSION
 from atlas.scoring import compute_prior_score
 